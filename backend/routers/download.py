@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Request, BackgroundTasks, Form
 from fastapi.responses import FileResponse, JSONResponse
 from pathlib import Path
+from urllib.parse import unquote
 from helpers.logger_config import setup_logger
 import zipfile # <-- New import
 import os # <-- New import
@@ -10,6 +11,78 @@ router = APIRouter()
 # Create a dedicated UI logger
 ui_logger = setup_logger("ui_download", ui=True)
 
+# Artifacts that are already compressed (written with --compress, or compressed formats);
+# they are stored in "Download All" zips as-is instead of being deflated again
+PRECOMPRESSED_SUFFIXES = {".gz", ".zst", ".parquet", ".docx", ".xlsx", ".zip"}
+
+# Pre-compressed variants of an artifact: file suffix -> (HTTP content coding, media type of the file itself)
+CONTENT_CODINGS = {".gz": ("gzip", "application/gzip"), ".zst": ("zstd", "application/zstd")}
+
+
+def zip_compress_type(path: Path) -> int:
+    """ZIP_STORED for artifacts that are already compressed, ZIP_DEFLATED for everything else."""
+    return zipfile.ZIP_STORED if path.suffix.lower() in PRECOMPRESSED_SUFFIXES else zipfile.ZIP_DEFLATED
+
+
+def precompressed_variant(full_path: Path, accept_encoding: str):
+    """
+    Returns (path, content coding) of a compressed copy of full_path (e.g. x.csv.gz for x.csv)
+    that the client accepts, or (None, None).
+    """
+    accepted = {coding.split(";")[0].strip().lower() for coding in accept_encoding.split(",")}
+    for suffix, (coding, _) in CONTENT_CODINGS.items():
+        candidate = full_path.with_name(full_path.name + suffix)
+        if coding in accepted and candidate.is_file():
+            return candidate, coding
+    return None, None
+
+
+def partition_files(directory: Path) -> dict:
+    """
+    Maps each partition value of a partitioned artifact (a directory of Hive-style
+    <column>=<value>/part-0.* folders) to its part file.
+    """
+    partitions = {}
+    for part_dir in sorted(p for p in directory.iterdir() if p.is_dir() and "=" in p.name):
+        files = sorted(f for f in part_dir.iterdir() if f.is_file())
+        if files:
+            partitions[unquote(part_dir.name.split("=", 1)[1])] = files[0]
+    return partitions
+
+
+def artifact_response(full_path: Path, request: Request):
+    """
+    FileResponse for a run artifact, or None when it does not exist.
+    Compressed artifacts are sent as stored. When an uncompressed name is requested but only its
+    .gz/.zst artifact exists, those bytes are sent with Content-Encoding (if the client accepts it),
+    so nothing is decompressed or re-compressed on the server.
+
+    A partitioned artifact (written with partition_by_server) answers ?server=<replicate server> with
+    that server's part file only; without the parameter it lists the available partitions.
+    """
+    if full_path.is_dir():
+        partitions = partition_files(full_path)
+        server = request.query_params.get("server")
+        if server is None:
+            return JSONResponse({"partitions": {value: f"{part.parent.name}/{part.name}"
+                                                for value, part in partitions.items()}})
+        part = partitions.get(server)
+        if part is None:
+            return None
+        media_type = CONTENT_CODINGS.get(part.suffix.lower(), (None, "application/octet-stream"))[1]
+        return FileResponse(part, filename=f"{server}_{full_path.name}", media_type=media_type)
+
+    if full_path.exists() and full_path.is_file():
+        media_type = CONTENT_CODINGS.get(full_path.suffix.lower(), (None, "application/octet-stream"))[1]
+        return FileResponse(full_path, filename=full_path.name, media_type=media_type)
+
+    compressed_path, coding = precompressed_variant(full_path, request.headers.get("accept-encoding", ""))
+    if compressed_path:
+        ui_logger.info(f"Serving pre-compressed {compressed_path} ({coding}) for {full_path.name}")
+        return FileResponse(compressed_path, filename=full_path.name, media_type="application/octet-stream",
+                            headers={"Content-Encoding": coding})
+    return None
+
 # --- HELPER FUNCTION FOR CLEANUP ---
 def cleanup_file(path: Path):
     """Removes the file after it's been sent."""
@@ -62,10 +135,17 @@ async def download_all(
             for file_path_str in outputs:
                 full_path = base_dir / Path(file_path_str)
 
-                if full_path.exists() and full_path.is_file():
+                if full_path.is_dir():
+                    # Partitioned artifact: keep its <column>=<value>/ folders inside the zip
+                    for part in sorted(p for p in full_path.rglob("*") if p.is_file()):
+                        arcname = Path(full_path.name) / part.relative_to(full_path)
+                        zipf.write(part, arcname=str(arcname), compress_type=zip_compress_type(part))
+                    ui_logger.debug(f"Added partitioned artifact to zip: {file_path_str}")
+                elif full_path.exists() and full_path.is_file():
                     # We use Path(file_path_str).name as the archive name to keep it clean (e.g., 'task_summary_20251020_155245.csv')
                     # This avoids including the GUID folder structure inside the zip
-                    zipf.write(full_path, arcname=Path(file_path_str).name)
+                    # Pre-compressed artifacts are stored as-is, so they are not deflated again on every request
+                    zipf.write(full_path, arcname=Path(file_path_str).name, compress_type=zip_compress_type(full_path))
                     ui_logger.debug(f"Added to zip: {file_path_str}")
                 else:
                     ui_logger.warning(f"File not found (skipped in zip): {file_path_str}")
@@ -105,9 +185,10 @@ async def download_file(file_path: str, request: Request):
     ui_logger.info(f"UI download request (single) from {client_ip}: {file_path}")
 
     try:
-        if full_path.exists() and full_path.is_file():
+        response = artifact_response(full_path, request)
+        if response is not None:
             ui_logger.info(f"File found: {full_path} — sending to client.")
-            return FileResponse(full_path, filename=full_path.name, media_type="application/octet-stream")
+            return response
         else:
             ui_logger.warning(f"File not found: {full_path}")
             return JSONResponse(status_code=404, content={"error": f"File not found: {file_path}"})
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, UploadFile, File, Request, Form
 from fastapi.responses import JSONResponse, FileResponse
+from starlette.concurrency import run_in_threadpool
 from pathlib import Path
 import uuid
 import os
 from ..services.runner import run_extraction
+from .download import artifact_response
 from helpers.logger_config import setup_logger
 
 
@@ -31,10 +33,11 @@ async def download_file(file_path: str, request: Request):
 
     ui_logger.info(f"Download request from {client_ip}: {file_path}")
 
-    if full_path.exists() and full_path.is_file():
+    response = artifact_response(full_path, request)
+    if response is not None:
         ui_logger.info(f"File found: {full_path}")
         backend_logger.info(f"Serving file to {client_ip}: {full_path}")
-        return FileResponse(full_path, filename=full_path.name, media_type="application/octet-stream")
+        return response
 
     ui_logger.warning(f"File not found: {full_path}")
     backend_logger.warning(f"Client {client_ip} requested missing file: {full_path}")
@@ -48,11 +51,20 @@ async def download_file(file_path: str, request: Request):
 async def upload_and_run(
     request: Request,
     json_files: list[UploadFile] = File(...),
-    tsv_file: UploadFile = File(...),
-    include_all_states: bool = Form(False)  #  new checkbox param, default is False
+    tsv_file: UploadFile | None = File(None),
+    tsv_files: list[UploadFile] | None = File(None),  # several QEM exports (one per QEM instance)
+    include_all_states: bool = Form(False),  #  new checkbox param, default is False
+    output_layout: str = Form("flat"),  # "flat" (merged CSV) or "star" (keyed tables + DuckDB views)
+    output_format: str = Form("csv"),  # "csv", "parquet" or "both"
+    write_merged_export: bool = Form(True),  # False: summary only, no exportRepositoryCSV file
+    output_compression: str = Form(""),  # "", "gzip" or "zstd"
+    write_database: bool = Form(False),  # also write run_<timestamp>.duckdb
+    write_excel: bool = Form(False),  # also write run_<timestamp>.xlsx
+    partition_by_server: bool = Form(False),  # replicate_server=<server>/ partition folders
+    summary_states: str = Form(""),  # comma-separated QEM states for the summary, e.g. "running,error"
 ):
     """
-    Accept multiple JSON files + one TSV file.
+    Accept multiple JSON files + one or more QEM TSV exports.
     Runs extraction and returns relative paths for download.
     """
     client_ip = request.client.host if request.client else "unknown"
@@ -62,7 +74,9 @@ async def upload_and_run(
 
     ui_logger.info(f"Upload request from {client_ip} — temp folder: {temp_folder}")
     backend_logger.info(f"Saving uploaded files to {temp_folder}")
-    backend_logger.info(f"Include all states: {include_all_states}")
+    backend_logger.info(f"Include all states: {include_all_states}, summary states: {summary_states or 'default'}, "
+                        f"output layout: {output_layout}, "
+                        f"output format: {output_format}, compression: {output_compression or 'none'}")
 
     saved_jsons = []
 
@@ -76,16 +90,36 @@ async def upload_and_run(
             saved_jsons.append(path)
             ui_logger.info(f"Saved JSON file: {path} ({len(data)} bytes)")
 
-        # Save TSV file
-        tsv_path = temp_folder / tsv_file.filename
-        data = await tsv_file.read()
-        with open(tsv_path, "wb") as f:
-            f.write(data)
-        ui_logger.info(f"Saved TSV file: {tsv_path} ({len(data)} bytes)")
+        # Save TSV file(s) into their own folder so exports with the same name do not collide
+        uploads = ([tsv_file] if tsv_file else []) + (tsv_files or [])
+        if not uploads:
+            return JSONResponse(status_code=400, content={"error": "At least one QEM TSV export is required."})
+
+        qem_folder = temp_folder / "qem"
+        qem_folder.mkdir(parents=True, exist_ok=True)
+        saved_tsvs = []
+        for idx, upload in enumerate(uploads):
+            tsv_path = qem_folder / upload.filename
+            if tsv_path.exists():
+                tsv_path = qem_folder / f"{tsv_path.stem}_{idx}{tsv_path.suffix}"
+            data = await upload.read()
+            with open(tsv_path, "wb") as f:
+                f.write(data)
+            saved_tsvs.append(tsv_path)
+            ui_logger.info(f"Saved TSV file: {tsv_path} ({len(data)} bytes)")
 
         # Run extraction
         backend_logger.info(f"Starting extraction for {client_ip} in {temp_folder}")
-        output_files = run_extraction(saved_jsons, tsv_path, temp_folder, include_all_states=include_all_states)
+        # On a worker thread so concurrent uploads run in parallel (each summary has its own DuckDB connection)
+        output_files = await run_in_threadpool(run_extraction, saved_jsons, saved_tsvs, temp_folder,
+                                               include_all_states=include_all_states,
+                                               output_layout=output_layout, output_format=output_format,
+                                               write_merged_export=write_merged_export,
+                                               output_compression=output_compression or None,
+                                               write_database=write_database, write_excel=write_excel,
+                                               partition_by_server=partition_by_server,
+                                               summary_states=[state for state in summary_states.split(",")
+                                                               if state.strip()] or None)
         backend_logger.info(f"Extraction completed for {client_ip}")
 
         # Convert to relative paths
@@ -99,6 +133,9 @@ async def upload_and_run(
             return obj
 
         result = {"outputs": relative_paths(output_files)}
+        manifest_path = next((p for p in output_files if p.name.startswith("run_manifest_")), None)
+        if manifest_path:
+            result["manifest"] = relative_paths(manifest_path)
 
         ui_logger.info(f"Extraction finished successfully for {client_ip}")
         return JSONResponse(result)
@@ -6,16 +6,20 @@ from datetime import datetime
 # Add project root to path
 
 from helpers.logger_config import setup_logger
-from main import extract_all_settings, retrieveTables, utils, summary, process_repository
+from main import extract_all_settings, retrieveTables, utils, summary, process_repository, OutputOptions, SummaryOptions
 
 # Initialize loggers
 backend_logger = setup_logger(__name__)
 ui_logger = setup_logger("ui_runner", ui=True)
 
 
-def run_extraction(json_paths, tsv_path, output_folder, include_all_states = False):
+def run_extraction(json_paths, tsv_path, output_folder, include_all_states = False, output_layout = "flat",
+                   output_format = "csv", write_merged_export = True, output_compression = None,
+                   write_database = False, write_excel = False, partition_by_server = False,
+                   summary_states = None):
     """
     Wraps your main.process_repository() logic for programmatic calls.
+    tsv_path may be a single QEM export or a list of exports (de-duplicated, newest wins).
     Logs both backend and UI-level events.
     Returns a list of file paths for download.
     """
@@ -27,7 +31,11 @@ def run_extraction(json_paths, tsv_path, output_folder, include_all_states = Fal
 
     try:
         # Run the core process
-        results = process_repository(json_paths, tsv_path, include_all_states)
+        output_options = OutputOptions(layout=output_layout, format=output_format, compression=output_compression,
+                                       merged_export=write_merged_export, database=write_database,
+                                       excel=write_excel, partition_by_server=partition_by_server)
+        results = process_repository(json_paths, tsv_path, include_all_states, output_options=output_options,
+                                     summary_options=SummaryOptions(states=summary_states))
 
         if not results:
             backend_logger.warning(f"No results returned from process_repository() for folder {folder}")
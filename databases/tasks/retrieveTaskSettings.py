@@ -10,6 +10,35 @@ from helpers.logger_config import setup_logger
 logging = setup_logger(__name__)
 
 
+# Columns of the task-level frame (one row per task); source/target extractors add their own columns
+TASK_SETTINGS_COLUMNS = [
+    'json_file_name', 'replicate_server', 'task_name', 'task_type', 'source_name', 'target_names', 'lob_max_size',
+    'table_count', 'target_table_schema', 'replication_hist_timeslot',
+    'attrep_exceptions_table', 'attrep_status_table', 'attrep_suspended_table',
+    'attrep_history_table', 'full_load', 'full_load_drop_target_tables',
+    'full_load_do_nothing', 'full_load_truncate_target_tables',
+    'create_pk_after_data_load', 'stop_task_after_full_load',
+    'stop_task_after_cached_events', 'max_full_load_tables',
+    'transaction_consistency_timeout', 'full_load_commit_rate', 'apply_changes',
+    'cdc_when_source_table_dropped', 'cdc_when_source_truncate',
+    'cdc_when_source_ddl', 'store_changes', 'store_changes_suffix',
+    'store_changes_column_prefix', 'store_changes_handle_DDL',
+    'store_changes_on_update', 'change_table_creation', 'header_columns_change_seq',
+    'header_columns_change_oper', 'header_columns_change_mask',
+    'header_columns_change_stream', 'header_columns_change_operation',
+    'header_columns_change_tran_id', 'header_columns_change_timestamp',
+    'statements_cache_size', 'cdc_apply_method', 'min_transaction_size_tran_apply',
+    'commit_timeout_tran_apply', 'cdc_batch_min',
+    'cdc_batch_max', 'cdc_batch_memory_limit', 'cdc_bulk_parallel_apply',
+    'cdc_bulk_parallel_apply_threads', 'cdc_transaction_memory',
+    'cdc_transaction_keep_time', 'cdc_statement_cache',
+    'cdc_store_recovery_in_target', 'pk_changes_handle_delete_insert',
+    'use_merge_for_batch', 'error_policy_apply_conflicts', 'delete_policy',
+    'insert_policy', 'update_policy', 'escalation_policy', 'stream_buffers_number',
+    'stream_buffer_size', 'target_ep_name'
+]
+
+
 def extract_task_settings(json_file_name,json_data, target_task_name):
     """
     Extracts task settings from a JSON data structure for a specific task name.
@@ -18,32 +47,7 @@ def extract_task_settings(json_file_name,json_data, target_task_name):
     tasks = json_data.get('cmd.replication_definition', {}).get('tasks', [])
     data = []
 
-    column_names = [
-        'json_file_name', 'replicate_server', 'task_name', 'task_type', 'source_name', 'target_names', 'lob_max_size',
-        'table_count', 'target_table_schema', 'replication_hist_timeslot',
-        'attrep_exceptions_table', 'attrep_status_table', 'attrep_suspended_table',
-        'attrep_history_table', 'full_load', 'full_load_drop_target_tables',
-        'full_load_do_nothing', 'full_load_truncate_target_tables',
-        'create_pk_after_data_load', 'stop_task_after_full_load',
-        'stop_task_after_cached_events', 'max_full_load_tables',
-        'transaction_consistency_timeout', 'full_load_commit_rate', 'apply_changes',
-        'cdc_when_source_table_dropped', 'cdc_when_source_truncate',
-        'cdc_when_source_ddl', 'store_changes', 'store_changes_suffix',
-        'store_changes_column_prefix', 'store_changes_handle_DDL',
-        'store_changes_on_update', 'change_table_creation', 'header_columns_change_seq',
-        'header_columns_change_oper', 'header_columns_change_mask',
-        'header_columns_change_stream', 'header_columns_change_operation',
-        'header_columns_change_tran_id', 'header_columns_change_timestamp',
-        'statements_cache_size', 'cdc_apply_method', 'min_transaction_size_tran_apply',
-        'commit_timeout_tran_apply', 'cdc_batch_min',
-        'cdc_batch_max', 'cdc_batch_memory_limit', 'cdc_bulk_parallel_apply',
-        'cdc_bulk_parallel_apply_threads', 'cdc_transaction_memory',
-        'cdc_transaction_keep_time', 'cdc_statement_cache',
-        'cdc_store_recovery_in_target', 'pk_changes_handle_delete_insert',
-        'use_merge_for_batch', 'error_policy_apply_conflicts', 'delete_policy',
-        'insert_policy', 'update_policy', 'escalation_policy', 'stream_buffers_number',
-        'stream_buffer_size', 'target_ep_name'
-    ]
+    column_names = list(TASK_SETTINGS_COLUMNS)
 
     for task in tasks:
         if task.get('task', {}).get('name') != target_task_name:
@@ -0,0 +1,85 @@
+"""
+Benchmarks stream_dataframe_to_csv against the original write_dataframe_to_csv.
+
+Builds a synthetic frame shaped like exportRepositoryCSV (many text setting columns, numeric, boolean
+and mixed-type columns, NULLs, and a handful of columns with multi-line values), writes it with both writers, checks
+the files are identical and that the new writer left its input untouched, and prints timings.
+
+    python -m helpers.benchmarkCsvWriter --rows 200000 --columns 120
+"""
+import os
+import time
+import argparse
+import filecmp
+import tempfile
+import tracemalloc
+import numpy as np
+import pandas as pd
+from helpers.utils import write_dataframe_to_csv, stream_dataframe_to_csv
+
+
+def build_frame(rows, columns, newline_columns=3, seed=7):
+    """Synthetic merged-export frame: mostly short strings, some numbers, some NULLs, a few multi-line columns."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(columns):
+        kind = i % 4
+        if kind == 0:
+            values = rng.integers(0, 10_000, rows)
+            data[f"num_{i}"] = values
+        elif kind == 1:
+            values = np.where(rng.random(rows) < 0.2, None, rng.choice(["TRUE", "FALSE", "NA", "NULL"], rows))
+            data[f"flag_{i}"] = pd.Series(values, dtype="object")
+        else:
+            data[f"text_{i}"] = pd.Series(rng.choice(["ORACLE", "SQL_SERVER", "SNOWFLAKE", "KAFKA", "S3"], rows), dtype="object")
+    data["lob_max_size"] = pd.Series([8 if small else "UnlimitedLob" for small in rng.random(rows) < 0.5], dtype="object")
+    data["apply_changes"] = rng.random(rows) < 0.5
+    data["memory_ratio"] = np.where(rng.random(rows) < 0.1, np.nan, rng.random(rows) * 100)
+    for i in range(newline_columns):
+        values = rng.choice(["single line", "first line\nsecond line", "crlf\r\nvalue", None], rows)
+        data[f"description_{i}"] = pd.Series(values, dtype="object")
+    return pd.DataFrame(data)
+
+
+def timed(label, func, trace_memory=False):
+    """Runs func once and returns its wall time; with trace_memory also reports the peak traced allocation."""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    memory = ""
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        memory = f"   peak {peak / 1024 / 1024:8.1f} MiB (traced, slower)"
+    print(f"\n{label:28} {seconds:8.2f} s{memory}")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--columns", type=int, default=80)
+    parser.add_argument("--memory", action="store_true", help="Also trace peak memory (makes both writers slower)")
+    args = parser.parse_args()
+
+    df = build_frame(args.rows, args.columns)
+    print(f"Frame: {len(df)} rows x {df.shape[1]} columns")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path = os.path.join(tmp, "old.csv")
+        new_path = os.path.join(tmp, "new.csv")
+        before = df.copy()
+
+        # The original writer scrubs columns in place, so it gets its own copy (as main.py had to do)
+        old_seconds = timed("write_dataframe_to_csv", lambda: write_dataframe_to_csv(df.copy(), old_path), args.memory)
+        new_seconds = timed("stream_dataframe_to_csv", lambda: stream_dataframe_to_csv(df, new_path), args.memory)
+
+        print(f"Speed-up: {old_seconds / new_seconds:.2f}x")
+        print(f"Identical output: {filecmp.cmp(old_path, new_path, shallow=False)}")
+        print(f"Input unchanged: {df.equals(before)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import os
+import uuid
+import hashlib
+import pandas as pd
+from helpers.logger_config import setup_logger
+from helpers.utils import make_arrow_safe
+
+logging = setup_logger(__name__)
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DEFAULT_CACHE_DIR = os.getenv("EXTRACTOR_CACHE_DIR") or os.path.join(BASE_DIR, "cache")
+DEFAULT_CACHE_MAX_MB = float(os.getenv("EXTRACTOR_CACHE_MAX_MB") or 512)
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """Returns the SHA-256 hex digest of a file's content, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FrameCache:
+    """
+    Content-addressed cache of DataFrames stored as Parquet files.
+
+    Entries live in <cache_dir>/<namespace>/<key>.parquet and are shared by CLI runs and backend jobs.
+    Reads refresh an entry's modification time; when the whole cache directory grows past max_mb the
+    least recently used entries are evicted. With max_mb 0 the cache is disabled and every lookup misses.
+    """
+
+    def __init__(self, namespace, cache_dir=None, max_mb=None):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.namespace_dir = os.path.join(self.cache_dir, namespace)
+        self.max_bytes = int((DEFAULT_CACHE_MAX_MB if max_mb is None else max_mb) * 1024 * 1024)
+        self.enabled = self.max_bytes > 0
+
+    def _path(self, key):
+        return os.path.join(self.namespace_dir, f"{key}.parquet")
+
+    def get(self, key):
+        """Returns the cached DataFrame for key, or None on a miss."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            df = pd.read_parquet(path)
+            os.utime(path)  # mark as recently used
+            logging.info(f"Cache hit: {path}")
+            return df
+        except Exception as e:
+            logging.warning(f"Discarding unreadable cache entry {path}: {e}")
+            self._remove(path)
+            return None
+
+    def put(self, key, df):
+        """Stores df under key (atomically) and enforces the size bound."""
+        if not self.enabled:
+            return None
+        os.makedirs(self.namespace_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            make_arrow_safe(df).to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+            logging.info(f"Cached {len(df)} rows: {path}")
+        except Exception as e:
+            logging.warning(f"Could not write cache entry {path}: {e}")
+            self._remove(tmp_path)
+            return None
+        self.evict()
+        return path
+
+    def evict(self):
+        """Removes least recently used entries until the cache directory fits in max_bytes."""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".parquet"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            logging.info(f"Evicted cache entry: {path}")
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -1,52 +1,121 @@
-import pandas as pd
-import win32com.client as win32
-import os
-
-# Sample data
-data = {
-    'Region': ['North', 'South', 'East', 'West', 'North'],
-    'Product': ['A', 'B', 'C', 'D', 'A'],
-    'Sales': [100, 200, 150, 300, 120]
+import re
+import xlsxwriter
+from xlsxwriter.utility import xl_col_to_name
+from helpers.logger_config import setup_logger
+from helpers.utils import prepare_for_parquet
+
+logging = setup_logger(__name__)
+
+# Excel limits: rows per sheet (including the header row) and sheet name length
+EXCEL_MAX_ROWS = 1_048_576
+SHEET_NAME_MAX = 31
+INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+# Rows converted from pandas at a time; constant_memory mode flushes each row to disk as it is written
+ROW_CHUNK = 10_000
+
+WORKBOOK_OPTIONS = {
+    "constant_memory": True,
+    "strings_to_formulas": False,  # setting values such as '=x' must stay text
+    "strings_to_urls": False,
+    "strings_to_numbers": False,
+    "nan_inf_to_errors": True,
 }
-df = pd.DataFrame(data)
-file = 'pivot_slicer.xlsx'
-df.to_excel(file, sheet_name='Data', index=False)
-
-# Open Excel and setup pivot
-excel = win32.gencache.EnsureDispatch('Excel.Application')
-excel.Visible = True  # Set to False to run in background
-wb = excel.Workbooks.Open(os.path.abspath(file))
-ws = wb.Sheets('Data')
-
-# Add a new worksheet for Pivot
-pivot_ws = wb.Sheets.Add()
-pivot_ws.Name = 'PivotTableSheet'
-
-# Define pivot range
-last_row = len(df) + 1
-pivot_range = ws.Range(f"A1:C{last_row}")
-
-# Create Pivot Cache
-pivot_cache = wb.PivotCaches().Create(
-    SourceType=1,  # xlDatabase
-    SourceData=pivot_range
-)
-
-# Create Pivot Table
-pivot_table = pivot_cache.CreatePivotTable(
-    TableDestination=pivot_ws.Range("A3"),
-    TableName="SalesPivot"
-)
-
-# Add Pivot Fields
-pivot_table.PivotFields("Region").Orientation = 1  # xlRowField
-pivot_table.PivotFields("Product").Orientation = 2  # xlColumnField
-pivot_table.PivotFields("Sales").Orientation = 4  # xlDataField
-
-# Add Slicer for 'Region'
-slicer_cache = wb.SlicerCaches.Add2(pivot_table, 'Region')
-slicer = slicer_cache.Slicers.Add(pivot_ws, None, 'Region', 'Region', 300, 100, 144, 200)
-
-# Save and clean up
-wb.Save()
-# excel.Quit()  # Uncomment to close Excel automatically
+
+
+def _sheet_name(name, used):
+    """Excel-safe, unique sheet name (max 31 chars, no []:*?/\\)."""
+    base = INVALID_SHEET_CHARS.sub("_", str(name))[:SHEET_NAME_MAX] or "Sheet"
+    candidate, n = base, 2
+    while candidate.lower() in used:
+        suffix = f" ({n})"
+        candidate = base[:SHEET_NAME_MAX - len(suffix)] + suffix
+        n += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def _range_name(sheet_name):
+    """Workbook-level name for a sheet's data range, usable as a PivotTable source (e.g. data_taskSettings)."""
+    return "data_" + re.sub(r"\W", "_", sheet_name)
+
+
+def _rows(df):
+    """Yields the rows of df as tuples, with missing values as None, converting ROW_CHUNK rows at a time."""
+    for start in range(0, len(df), ROW_CHUNK):
+        chunk = df.iloc[start:start + ROW_CHUNK].astype(object)
+        chunk = chunk.where(chunk.notna(), None)
+        yield from chunk.itertuples(index=False, name=None)
+
+
+def _write_frame(workbook, sheet_name, df, header_format, used):
+    """
+    Writes df to one or more sheets (continuation sheets past Excel's row limit), each with a frozen
+    header row, an autofilter and a workbook-level name over the data range for PivotTables.
+    """
+    df = prepare_for_parquet(df)  # placeholder NULL/NA values become blanks, numeric text becomes numbers
+    columns = [str(c) for c in df.columns]
+    last_col = max(len(columns) - 1, 0)
+    per_sheet = EXCEL_MAX_ROWS - 1
+    rows = _rows(df)
+    written = 0
+    part = 0
+    while part == 0 or written < len(df):
+        name = _sheet_name(sheet_name if part == 0 else f"{sheet_name} {part + 1}", used)
+        worksheet = workbook.add_worksheet(name)
+        worksheet.freeze_panes(1, 0)
+        worksheet.write_row(0, 0, columns, header_format)
+        count = min(per_sheet, len(df) - written)
+        for r in range(1, count + 1):
+            worksheet.write_row(r, 0, next(rows))
+        if columns:
+            worksheet.autofilter(0, 0, max(count, 1), last_col)
+            workbook.define_name(_range_name(name), f"='{name}'!$A$1:${xl_col_to_name(last_col)}${count + 1}")
+        written += count
+        part += 1
+    return written
+
+
+def _write_summary(workbook, summary_tables, title_format, notes_format, header_format, used):
+    """Writes the summary sections one below the other on a 'Summary' sheet."""
+    worksheet = workbook.add_worksheet(_sheet_name("Summary", used))
+    row = 0
+    for section in summary_tables:
+        df = section["df"]
+        worksheet.write(row, 0, section["title"], title_format)
+        if section.get("notes"):
+            worksheet.write(row + 1, 0, section["notes"], notes_format)
+        row += 2
+        worksheet.write_row(row, 0, [str(c) for c in df.columns], header_format)
+        for values in _rows(df):
+            row += 1
+            worksheet.write_row(row, 0, values)
+        row += 2
+
+
+def write_workbook(xlsx_path, sheets, summary_tables=None):
+    """
+    Writes an .xlsx workbook in constant-memory mode (rows are streamed to disk, the workbook is never
+    held in RAM): an optional 'Summary' sheet with the summary sections, then one sheet per frame in
+    `sheets` (sheet name -> DataFrame). Data sheets get a frozen header, an autofilter and a
+    workbook-level name (data_<sheet>) to build PivotTables from. Empty frames are skipped.
+
+    Excel tables (ListObjects) are not available in constant-memory mode, hence the named ranges.
+    """
+    workbook = xlsxwriter.Workbook(xlsx_path, WORKBOOK_OPTIONS)
+    header_format = workbook.add_format({"bold": True, "bg_color": "#DDEBF7", "border": 1})
+    title_format = workbook.add_format({"bold": True, "font_size": 13})
+    notes_format = workbook.add_format({"italic": True, "font_color": "#595959"})
+    used = set()
+    try:
+        if summary_tables:
+            _write_summary(workbook, summary_tables, title_format, notes_format, header_format, used)
+        for name, df in sheets.items():
+            if df is None or df.shape[1] == 0:
+                continue
+            rows = _write_frame(workbook, name, df, header_format, used)
+            logging.info(f"Workbook sheet {name}: {rows} rows")
+    finally:
+        workbook.close()
+    logging.info(f"Wrote workbook: {xlsx_path}")
+    return xlsx_path
@@ -0,0 +1,207 @@
+import os
+import re
+import sys
+import glob
+import time
+import hashlib
+import threading
+from datetime import datetime
+import duckdb
+from helpers.logger_config import setup_logger
+from helpers import summary
+from helpers.queries.baseRelations import BASE_RELATIONS
+
+logging = setup_logger(__name__)
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+# One history database per customer: <EXTRACTOR_HISTORY_DIR>/<customer>.duckdb
+HISTORY_DIR = os.getenv("EXTRACTOR_HISTORY_DIR") or os.path.join(BASE_DIR, "history")
+
+# One writer per process: DuckDB allows a single read-write connection to a file
+_WRITE_LOCK = threading.Lock()
+
+# Another process holding the file (DuckDB's file lock) is waited for, doubling the wait on every retry
+HISTORY_LOCK_RETRIES = 6
+HISTORY_LOCK_WAIT = 0.5
+
+RUN_TIMESTAMP_PATTERN = re.compile(r"(\d{8}_\d{6})")
+
+# Every table row of a run (the task-level rows live in task_history)
+history_tables = """
+SELECT
+    replicate_server,
+    task_name,
+    state_key,
+    schema_name,
+    table_name,
+    source_server,
+    target_db_type,
+    target_server,
+    apply_changes_enabled,
+    store_changes_enabled
+FROM data_df
+WHERE table_name IS NOT NULL
+"""
+
+# Runs ingested so far; task_history and table_history reference them by run_id
+HISTORY_RUNS_SQL = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id VARCHAR PRIMARY KEY,
+    run_date TIMESTAMP NOT NULL,
+    ingested_at TIMESTAMP NOT NULL,
+    output_dir VARCHAR,
+    json_files VARCHAR[],
+    qem_exports VARCHAR[],
+    task_rows BIGINT,
+    table_rows BIGINT
+)
+"""
+
+# Index columns of the history tables: trend queries pick servers and tasks across run dates
+HISTORY_INDEXES = {
+    "task_history": ("replicate_server", "task_name", "run_date"),
+    "table_history": ("replicate_server", "task_name", "run_date"),
+}
+
+# Per-run totals for trend queries
+HISTORY_VIEWS_SQL = """
+CREATE OR REPLACE VIEW run_totals AS
+SELECT
+    r.run_id,
+    r.run_date,
+    t.replicate_server,
+    COUNT(DISTINCT t.task_name) AS tasks,
+    COUNT(DISTINCT t.task_name) FILTER (WHERE t.state_key = 'running') AS running_tasks,
+    CAST(SUM(t.table_rows) AS BIGINT) AS table_rows
+FROM runs r
+JOIN task_history t USING (run_id)
+GROUP BY ALL
+"""
+
+
+def history_run_id(run_date, output_dir=None):
+    """Run id of a run in the history: its timestamp, plus a hash of its output folder to keep runs apart."""
+    run_id = run_date.strftime("%Y%m%d_%H%M%S")
+    if output_dir:
+        run_id += "_" + hashlib.sha256(os.path.abspath(output_dir).encode("utf-8")).hexdigest()[:8]
+    return run_id
+
+
+def history_db_path(customer):
+    """History database file of a customer, named after it with path-unsafe characters replaced."""
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(customer)).strip("._")
+    if not name:
+        raise ValueError(f"Not a usable customer name for the history: {customer!r}")
+    return os.path.join(HISTORY_DIR, f"{name}.duckdb")
+
+
+def _connect(history_path):
+    """Opens the history database for writing, retrying while another process holds its lock."""
+    wait = HISTORY_LOCK_WAIT
+    for attempt in range(HISTORY_LOCK_RETRIES + 1):
+        try:
+            return duckdb.connect(history_path)
+        except duckdb.IOException as e:
+            if "lock" not in str(e).lower() or attempt == HISTORY_LOCK_RETRIES:
+                raise
+            logging.info(f"History database is locked by another process, retrying in {wait:.1f}s: {history_path}")
+            time.sleep(wait)
+            wait *= 2
+
+
+def _ensure_history_tables(con):
+    """Creates the history tables (typed like the summary's relations) and their indexes on first use."""
+    con.execute(HISTORY_RUNS_SQL)
+    con.execute("CREATE TABLE IF NOT EXISTS task_history AS "
+                "SELECT NULL::VARCHAR AS run_id, NULL::TIMESTAMP AS run_date, * FROM run_tasks LIMIT 0")
+    con.execute("CREATE TABLE IF NOT EXISTS table_history AS "
+                "SELECT NULL::VARCHAR AS run_id, NULL::TIMESTAMP AS run_date, * FROM run_tables LIMIT 0")
+    for table, columns in HISTORY_INDEXES.items():
+        con.execute(f"CREATE INDEX IF NOT EXISTS {table}_idx ON {table} ({', '.join(columns)})")
+    con.execute(HISTORY_VIEWS_SQL)
+
+
+def ingest_run(data_source, run_date, output_dir=None, inputs=None, customer=None, history_path=None):
+    """
+    Appends one run to the history database: a row in runs, its tasks (settings and state, one row per
+    task as in the summary's summary_tasks) in task_history and its table rows in table_history, all
+    stamped with the run id and run date. Runs already in the history are left untouched, so ingesting
+    a run twice is harmless. Returns the run id.
+    :param data_source: The run's merged rows, as accepted by summary.read_summary_data.
+    :param run_date: When the run was made (datetime).
+    :param output_dir: The run's output folder (recorded, and part of the run id).
+    :param inputs: The run's inputs, as recorded in its manifest ('json_files', 'qem_exports').
+    :param customer: Whose history the run belongs to; picks the database file (see history_db_path).
+    :param history_path: History database file, instead of the customer's.
+    """
+    if not (customer or history_path):
+        raise ValueError("A customer or a history database path is required")
+    history_path = history_path or history_db_path(customer)
+    inputs = inputs or {}
+    run_id = history_run_id(run_date, output_dir)
+    data = summary.read_summary_data(data_source)
+
+    os.makedirs(os.path.dirname(os.path.abspath(history_path)), exist_ok=True)
+    with _WRITE_LOCK:
+        con = _connect(history_path)
+        try:
+            con.register("summary_source", data)
+            con.execute(f"CREATE TEMP TABLE data_df AS {summary.summary_data_sql('summary_source', data.column_names)}")
+            con.execute(f"CREATE TEMP TABLE run_tasks AS {BASE_RELATIONS['summary_tasks']}")
+            con.execute(f"CREATE TEMP TABLE run_tables AS {history_tables}")
+            con.unregister("summary_source")
+            _ensure_history_tables(con)
+
+            con.execute("BEGIN TRANSACTION")
+            if con.execute("SELECT 1 FROM runs WHERE run_id = ?", [run_id]).fetchone():
+                con.execute("ROLLBACK")
+                logging.info(f"Run {run_id} is already in the history: {history_path}")
+                return run_id
+            task_rows = con.execute("SELECT COUNT(*) FROM run_tasks").fetchone()[0]
+            table_rows = con.execute("SELECT COUNT(*) FROM run_tables").fetchone()[0]
+            con.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        [run_id, run_date, datetime.now(), os.path.abspath(output_dir) if output_dir else None,
+                         list(inputs.get("json_files") or []), list(inputs.get("qem_exports") or []),
+                         task_rows, table_rows])
+            params = [run_id, run_date]
+            con.execute("INSERT INTO task_history BY NAME SELECT ? AS run_id, ? AS run_date, * FROM run_tasks", params)
+            con.execute("INSERT INTO table_history BY NAME SELECT ? AS run_id, ? AS run_date, * FROM run_tables", params)
+            con.execute("COMMIT")
+        finally:
+            con.close()
+    logging.info(f"Added run {run_id} to the history ({task_rows} tasks, {table_rows} tables): {history_path}")
+    return run_id
+
+
+def run_folder_source(run_dir):
+    """
+    Finds the summary dataset of a past run folder: its run database, else the merged export
+    (Parquet, then CSV), else the star schema views. Returns None when the folder holds none of them.
+    """
+    for pattern in ("run_*.duckdb", "exportRepositoryCSV_*.parquet", "exportRepositoryCSV_*.csv*", "star_views_*.sql"):
+        matches = sorted(glob.glob(os.path.join(run_dir, pattern)))
+        if matches:
+            return matches[-1]
+    return None
+
+
+def ingest_run_folder(run_dir, customer=None, history_path=None):
+    """Back-fills the history with a past run_output_<timestamp> folder. Returns the run id, or None."""
+    source = run_folder_source(run_dir)
+    match = RUN_TIMESTAMP_PATTERN.search(os.path.basename(os.path.normpath(run_dir)))
+    if source is None or match is None:
+        logging.warning(f"Not a run folder with a merged export, run database or star views: {run_dir}")
+        return None
+    run_date = datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+    return ingest_run(source, run_date, output_dir=run_dir, customer=customer, history_path=history_path)
+
+
+def main():
+    # python -m helpers.historyStore <run_output_folder> [...] --customer=<name> | --history=path/to/history.duckdb
+    options = dict(arg[2:].split("=", 1) for arg in sys.argv[1:] if arg.startswith("--") and "=" in arg)
+    for run_dir in sorted(arg for arg in sys.argv[1:] if not arg.startswith("--")):
+        ingest_run_folder(run_dir, options.get("customer"), options.get("history"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from helpers.logger_config import setup_logger
+
+logging = setup_logger(__name__)
+
+# Writer threads per run; the writes are I/O bound (DuckDB and pyarrow release the GIL while writing)
+DEFAULT_OUTPUT_WORKERS = int(os.getenv("EXTRACTOR_OUTPUT_WORKERS") or min(8, (os.cpu_count() or 1) + 2))
+
+
+class OutputStage:
+    """
+    Runs a run's independent artifact writes on a thread pool.
+
+    Callers submit each write as soon as its input frame is ready and keep going; wait() blocks
+    until the named artifacts (or all of them) are written and re-raises the first failure.
+    Per-artifact wall and CPU times are collected in `timings` and `cpu_timings` (artifact name -> seconds),
+    and the stage's own wall time, from creation to close(), in `wall_seconds`.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or DEFAULT_OUTPUT_WORKERS
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="output-writer")
+        self._futures = {}
+        self._lock = threading.Lock()
+        self.timings = {}
+        self.cpu_timings = {}
+        self.wall_seconds = None
+        self._started = time.perf_counter()
+
+    def submit(self, name, func, *args, **kwargs):
+        """Schedules func(*args, **kwargs) as the write of artifact `name` and returns its future."""
+        def timed():
+            start, cpu_start = time.perf_counter(), time.thread_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.timings[name] = time.perf_counter() - start
+                    self.cpu_timings[name] = time.thread_time() - cpu_start
+
+        future = self._pool.submit(timed)
+        with self._lock:
+            self._futures[name] = future
+        return future
+
+    def wait(self, *names):
+        """
+        Waits for the named artifacts (all submitted ones when none are given, including writes that running
+        jobs submit while waiting) and raises the first error.
+        """
+        done = set()
+        while True:
+            with self._lock:
+                futures = [self._futures[n] for n in names] if names else list(self._futures.values())
+            futures = [future for future in futures if future not in done]
+            if not futures:
+                return
+            wait(futures)
+            for future in futures:
+                future.result()
+            done.update(futures)
+
+    def close(self):
+        """Waits for every pending write and shuts the pool down."""
+        self._pool.shutdown(wait=True)
+        if self.wall_seconds is None:
+            self.wall_seconds = time.perf_counter() - self._started
+
+    def log_timings(self):
+        """Logs the per-artifact write times, slowest first."""
+        for name, seconds in sorted(self.timings.items(), key=lambda item: item[1], reverse=True):
+            logging.info(f"  {name:40} {seconds:8.2f} s")
+        logging.info(f"Output stage: {len(self.timings)} artifacts on {self.max_workers} writer threads, "
+                     f"{sum(self.timings.values()):.2f} s of write time")
@@ -0,0 +1,247 @@
+import io
+import os
+import re
+import csv
+import glob
+from contextlib import contextmanager
+from datetime import datetime
+import pandas as pd
+from helpers.logger_config import setup_logger
+from helpers.qemIndex import normalize_key, normalize_server_key
+from helpers.cache import FrameCache, file_hash
+
+logging = setup_logger(__name__)
+
+# AemTasks_2025-10-08_13.48.03.491.tsv -> 2025-10-08 13:48:03.491
+QEM_TIMESTAMP_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})_(\d{2})\.(\d{2})\.(\d{2})(?:\.(\d+))?")
+
+# Bump when parse_qem_export() changes so stale cache entries are not reused
+QEM_CACHE_VERSION = "v1"
+SERVER_KEY_COL = "__server_key"
+TASK_KEY_COL = "__task_key"
+
+
+def resolve_qem_paths(qem_export_path):
+    """
+    Accepts a single QEM TSV path, a folder containing QEM TSVs, or a list/tuple of either.
+    Returns the list of TSV files to read. Previously written '_cleaned' copies are ignored.
+    """
+    items = qem_export_path if isinstance(qem_export_path, (list, tuple)) else [qem_export_path]
+    paths = []
+    for item in items:
+        item = str(item)
+        if os.path.isdir(item):
+            found = sorted(glob.glob(os.path.join(item, "*.tsv")))
+            paths.extend(p for p in found if not p.endswith("_cleaned.tsv"))
+        else:
+            paths.append(item)
+
+    if not paths:
+        logging.error(f"No QEM export files found in {qem_export_path}")
+        raise FileNotFoundError(f"No QEM export files found in {qem_export_path}")
+    return paths
+
+
+def name_timestamp(name):
+    """Returns the export time encoded in a QEM file name (AemTasks_YYYY-MM-DD_HH.MM.SS.fff.tsv), or None."""
+    match = QEM_TIMESTAMP_PATTERN.search(os.path.basename(str(name)))
+    if not match:
+        return None
+    day, hour, minute, second, fraction = match.groups()
+    micro = int((fraction or "0").ljust(6, "0")[:6])
+    return datetime.strptime(f"{day} {hour}:{minute}:{second}", "%Y-%m-%d %H:%M:%S").replace(microsecond=micro)
+
+
+def export_timestamp(path):
+    """
+    Returns the export time encoded in a QEM file name (AemTasks_YYYY-MM-DD_HH.MM.SS.fff.tsv).
+    Falls back to the file modification time when the name carries no timestamp.
+    """
+    return name_timestamp(path) or datetime.fromtimestamp(os.path.getmtime(path))
+
+
+@contextmanager
+def _open_export(source):
+    """Opens a QEM export given as a path, bytes or a text/binary file-like object for csv reading."""
+    if isinstance(source, (bytes, bytearray)):
+        yield io.StringIO(bytes(source).decode('utf-8-sig'), newline='')
+    elif isinstance(source, io.TextIOBase):
+        yield source
+    elif hasattr(source, 'read'):
+        wrapper = io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+        try:
+            yield wrapper
+        finally:
+            wrapper.detach()  # leave the caller's stream open
+    else:
+        with open(source, 'r', encoding='utf-8-sig', newline='') as infile:
+            yield infile
+
+
+def iter_qem_rows(source):
+    """
+    Streams a QEM TSV export (path, bytes or file-like object) row by row as (header, row) pairs.
+    Quoted fields spanning several lines are handled by the csv module directly, so no cleaned copy is written.
+    """
+    with _open_export(source) as infile:
+        reader = csv.reader(infile, delimiter='\t', quotechar='"')
+        header = None
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            if header is None:
+                header = [cell.strip() for cell in row]
+                continue
+            yield header, row
+
+
+def parse_qem_export(path):
+    """
+    Parses one QEM export (path, bytes or file-like object) into a DataFrame of strings (empty cells become None), plus the
+    normalized server/task key columns used for de-duplication and joins.
+    """
+    header = None
+    records = []
+    for row_header, row in iter_qem_rows(path):
+        header = row_header
+        records.append({col: (value if value != "" else None) for col, value in zip(header, row)})
+
+    df = pd.DataFrame.from_records(records, columns=header or [])
+    lowered = {col.lower(): col for col in df.columns}
+    server_col, task_col = lowered.get("server"), lowered.get("task")
+    df[SERVER_KEY_COL] = df[server_col].map(normalize_server_key) if server_col else None
+    df[TASK_KEY_COL] = df[task_col].map(normalize_key) if task_col else None
+    return df
+
+
+def load_qem_export(path, cache=None):
+    """
+    Returns the parsed frame of one QEM export, served from the snapshot cache when the
+    file content (SHA-256) has been parsed before by any CLI run or backend job.
+    """
+    cache = cache if cache is not None else FrameCache("qem")
+    key = f"{QEM_CACHE_VERSION}-{file_hash(path)}"
+    df = cache.get(key)
+    if df is None:
+        df = parse_qem_export(path)
+        cache.put(key, df)
+    return df
+
+
+def read_qem_exports(qem_export_path, prefix="qem_", cache=None):
+    """
+    Reads one or more QEM exports into a single DataFrame with prefixed column names.
+
+    Files are read newest first (by the timestamp in the file name) and rows are
+    de-duplicated on the normalized (Server, Task) key, so each task keeps the state from
+    the most recent export. Duplicates inside one export are left for the QEM index to report.
+    With the snapshot cache, each export's parsed frame is cached and the surviving rows are
+    combined in one concat (see combine_qem_exports); without it the exports are streamed
+    through one reader (see stream_qem_exports). Either way the combined frame is built once.
+    """
+    paths = sorted(resolve_qem_paths(qem_export_path), key=export_timestamp, reverse=True)
+    cache = cache if cache is not None else FrameCache("qem")
+    if not cache.enabled:
+        return stream_qem_exports([(os.path.basename(path), path) for path in paths], prefix)
+    named_frames = []
+    for path in paths:
+        logging.info(f"Reading QEM export: {path}")
+        named_frames.append((os.path.basename(path), load_qem_export(path, cache)))
+    return combine_qem_exports(named_frames, prefix)
+
+
+def read_qem_sources(sources, prefix="qem_"):
+    """
+    In-memory counterpart of read_qem_exports: nothing is cached or written. sources is one source or a
+    list of them; a source is a path (file or folder), bytes, a file-like object or a (name, source) pair.
+    Exports are ranked by the timestamp in their (file) name; sources without one rank below those that
+    have one and keep their given order (the earlier source wins).
+    """
+    items = list(sources) if isinstance(sources, list) else [sources]
+    ranked = []
+    for index, item in enumerate(items):
+        name, source = item if isinstance(item, tuple) else (None, item)
+        if isinstance(source, (str, os.PathLike)):
+            ranked.extend((os.path.basename(path), path, export_timestamp(path)) for path in resolve_qem_paths(source))
+            continue
+        file_name = getattr(source, "name", None)
+        name = name or (os.path.basename(file_name) if isinstance(file_name, str) else f"qem_export_{index}")
+        ranked.append((name, source, name_timestamp(name) or datetime.min))
+
+    ranked.sort(key=lambda entry: entry[2], reverse=True)  # stable: ties keep their given order
+    return stream_qem_exports([(name, source) for name, source, _ in ranked], prefix)
+
+
+def stream_qem_exports(named_sources, prefix="qem_"):
+    """
+    Streams exports given newest first as (name, source) pairs through one csv reader, dropping rows whose
+    normalized (Server, Task) key was already seen in a newer export, and builds the prefixed frame once
+    from the surviving rows.
+    """
+    columns = []
+    rows = []
+    seen = set()
+    duplicates = 0
+
+    for name, source in named_sources:
+        logging.info(f"Reading QEM export: {name}")
+        file_keys = set()
+        file_rows = 0
+        server_idx = task_idx = None
+        for header, row in iter_qem_rows(source):
+            if server_idx is None:
+                lowered = [col.lower() for col in header]
+                server_idx = lowered.index("server") if "server" in lowered else -1
+                task_idx = lowered.index("task") if "task" in lowered else -1
+                columns.extend(col for col in header if col not in columns)
+
+            if server_idx >= 0 and task_idx >= 0 and max(server_idx, task_idx) < len(row):
+                key = (normalize_server_key(row[server_idx]), normalize_key(row[task_idx]))
+                if key[0] is not None and key[1] is not None:
+                    if key in seen:
+                        duplicates += 1
+                        continue
+                    file_keys.add(key)
+
+            rows.append({col: (value if value != "" else None) for col, value in zip(header, row)})
+            file_rows += 1
+
+        # Keys only shadow older exports; duplicates inside one export are left for the QEM index to report
+        seen.update(file_keys)
+        logging.info(f"Kept {file_rows} rows from {name}")
+
+    if duplicates:
+        logging.info(f"Skipped {duplicates} QEM rows already present in a newer export")
+
+    qem_df = pd.DataFrame.from_records(rows, columns=columns)
+    qem_df.columns = [f"{prefix}{col}" for col in columns]
+    return qem_df
+
+
+def combine_qem_exports(named_frames, prefix="qem_"):
+    """
+    Combines parsed (cached) exports given newest first as (name, frame) pairs: rows whose normalized
+    (Server, Task) key is already in a newer export are dropped, each frame is cut down to its surviving
+    rows and value columns, and the slices are concatenated once with prefixed columns.
+    """
+    slices = []
+    seen = set()
+    duplicates = 0
+
+    for name, df in named_frames:
+        keyed = df[SERVER_KEY_COL].notna() & df[TASK_KEY_COL].notna()
+        keys = pd.MultiIndex.from_arrays([df[SERVER_KEY_COL], df[TASK_KEY_COL]])
+        shadowed = keyed & keys.isin(seen) if seen else pd.Series(False, index=df.index)
+        value_columns = [col for col in df.columns if col not in (SERVER_KEY_COL, TASK_KEY_COL)]
+        duplicates += int(shadowed.sum())
+        # Keys only shadow older exports; duplicates inside one export are left for the QEM index to report
+        seen.update(keys[keyed.to_numpy()])
+        slices.append(df.loc[~shadowed.to_numpy(), value_columns])
+        logging.info(f"Kept {len(slices[-1])} rows from {name}")
+
+    if duplicates:
+        logging.info(f"Skipped {duplicates} QEM rows already present in a newer export")
+
+    qem_df = slices[0] if len(slices) == 1 else pd.concat(slices, ignore_index=True)
+    qem_df.columns = [f"{prefix}{col}" for col in qem_df.columns]
+    return qem_df
@@ -0,0 +1,187 @@
+import re
+import pandas as pd
+from helpers.logger_config import setup_logger
+
+logging = setup_logger(__name__)
+
+UNMATCHED_COLUMNS = ['side', 'reason', 'server', 'task', 'server_key', 'task_key']
+
+
+def normalize_key(value):
+    """
+    Normalizes a join key: collapses whitespace and case-folds.
+    Returns None for missing values so they never match each other.
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    text = " ".join(str(value).split()).casefold()
+    if text in ("", "null", "nan", "none"):
+        return None
+    return text
+
+
+def normalize_server_key(value):
+    """
+    Normalizes a server key coming from a JSON file name, a repository host name or the QEM 'Server' column.
+    A trailing '.json' / '.tsv' extension is dropped so file names and host names line up.
+    """
+    key = normalize_key(value)
+    if key is None:
+        return None
+    return re.sub(r"\.(json|tsv)$", "", key)
+
+
+def short_server_key(server_key):
+    """Returns the host part of a (possibly fully qualified) server key, e.g. 'repl01.corp.local' -> 'repl01'."""
+    if not server_key:
+        return None
+    return server_key.split(".", 1)[0]
+
+
+class QemIndex:
+    """
+    Hash index over the QEM export, built once per run.
+
+    Rows are keyed on the normalized (server, task) pair and additionally on the short host name,
+    so lookups tolerate case, whitespace and host/file naming differences between the repository
+    JSON exports and the QEM 'Server'/'Task' columns. The short host name is only used when it stands
+    for exactly one full host in the export and one side of the lookup is unqualified, so two different
+    servers sharing a host prefix never match.
+    """
+
+    def __init__(self, qem_df, task_col, server_col):
+        self.qem_df = qem_df.reset_index(drop=True)
+        self.task_col = task_col
+        self.server_col = server_col
+        self._exact = {}
+        self._short = {}
+        self._short_hosts = {}
+        self._duplicates = set()
+
+        for pos, (server, task) in enumerate(zip(self.qem_df[server_col], self.qem_df[task_col])):
+            server_key = normalize_server_key(server)
+            task_key = normalize_key(task)
+            if server_key is None or task_key is None:
+                continue
+            if (server_key, task_key) in self._exact:
+                self._duplicates.add(pos)
+                continue
+            self._exact[(server_key, task_key)] = pos
+            self._short_hosts.setdefault(short_server_key(server_key), set()).add(server_key)
+
+            short_key = (short_server_key(server_key), task_key)
+            existing = self._short.get(short_key)
+            if existing is None and short_key not in self._short:
+                self._short[short_key] = pos
+            elif existing is not None and normalize_server_key(self.qem_df.at[existing, server_col]) != server_key:
+                # Same short host on two different servers: ambiguous, never match on it
+                self._short[short_key] = None
+
+        self._matched = set()
+        logging.info(f"Built QEM index: {len(self._exact)} keys, {len(self._duplicates)} duplicate rows")
+
+    def lookup(self, task, *servers):
+        """
+        Returns the QEM row position for a task, trying each candidate server in order
+        (exact normalized key first, then short host name). Returns None when nothing matches.
+        """
+        task_key = normalize_key(task)
+        if task_key is None:
+            return None
+        server_keys = [k for k in (normalize_server_key(s) for s in servers) if k]
+        for server_key in server_keys:
+            pos = self._exact.get((server_key, task_key))
+            if pos is not None:
+                return pos
+        for server_key in server_keys:
+            short_key = short_server_key(server_key)
+            hosts = self._short_hosts.get(short_key, ())
+            if len(hosts) != 1:
+                continue  # unknown or ambiguous short host
+            (host,) = hosts
+            if server_key != short_key and host != short_key:
+                continue  # two fully qualified names that only share the host part
+            pos = self._short.get((short_key, task_key))
+            if pos is not None:
+                return pos
+        return None
+
+    def match(self, df, task_col, server_cols):
+        """Returns a list of QEM row positions (or None) aligned with the rows of df."""
+        positions = [self.lookup(task, *servers) for task, *servers in zip(df[task_col], *_columns(df, server_cols))]
+        self._matched.update(p for p in positions if p is not None)
+        return positions
+
+    def merge(self, df, task_col='task_name', server_cols=('json_file_name', 'replicate_server')):
+        """
+        Left-joins the QEM columns onto df using the index.
+        Equivalent to df.merge(qem_df, how='left') on normalized keys, without re-hashing the QEM side.
+        """
+        positions = self.match(df, task_col, server_cols)
+        right = self.qem_df.reindex([-1 if p is None else p for p in positions]).reset_index(drop=True)
+        merged = pd.concat([df.reset_index(drop=True), right], axis=1)
+        unmatched = sum(p is None for p in positions)
+        if unmatched:
+            logging.warning(f"{unmatched} of {len(df)} repository tasks have no matching QEM row")
+        return merged
+
+    def unmatched_report(self, df, task_col='task_name', server_cols=('json_file_name', 'replicate_server')):
+        """
+        Builds a report of join misses:
+          - repository tasks without a QEM row,
+          - QEM rows that no repository task matched,
+          - duplicate QEM rows for the same normalized (server, task) key.
+        """
+        rows = []
+        for task, *servers in zip(df[task_col], *_columns(df, server_cols)):
+            if self.lookup(task, *servers) is None:
+                server = next((s for s in servers if normalize_server_key(s)), None)
+                rows.append(self._report_row('repository', 'no_qem_row', server, task))
+
+        for pos in range(len(self.qem_df)):
+            server = self.qem_df.at[pos, self.server_col]
+            task = self.qem_df.at[pos, self.task_col]
+            if pos in self._duplicates:
+                rows.append(self._report_row('qem', 'duplicate_qem_key', server, task))
+            elif pos not in self._matched:
+                rows.append(self._report_row('qem', 'no_repository_task', server, task))
+
+        return pd.DataFrame(rows, columns=UNMATCHED_COLUMNS)
+
+    @staticmethod
+    def _report_row(side, reason, server, task):
+        return {
+            'side': side,
+            'reason': reason,
+            'server': server,
+            'task': task,
+            'server_key': normalize_server_key(server),
+            'task_key': normalize_key(task),
+        }
+
+
+def _columns(df, cols):
+    """Returns the listed columns of df, substituting all-None values for the ones that are missing."""
+    return [df[c] if c in df.columns else [None] * len(df) for c in cols]
+
+
+def merge_tables(task_qem_df, tables_df):
+    """
+    Outer-joins table rows onto the task/QEM frame on normalized (server, task) keys.
+    Tables are matched by JSON file name, same as the task settings. Rows with a missing server or task
+    key never match anything (pandas would pair missing keys with each other); they are kept unmatched.
+    """
+    left_keys = pd.DataFrame({'key_0': task_qem_df['json_file_name'].map(normalize_server_key),
+                              'key_1': task_qem_df['task_name'].map(normalize_key)}, index=task_qem_df.index)
+    right_keys = pd.DataFrame({'key_0': tables_df['tables_json_file_name'].map(normalize_server_key),
+                               'key_1': tables_df['tables_task_name'].map(normalize_key)}, index=tables_df.index)
+    left_keyed = left_keys.notna().all(axis=1)
+    right_keyed = right_keys.notna().all(axis=1)
+    matched = task_qem_df[left_keyed].merge(tables_df[right_keyed], left_on=[left_keys.loc[left_keyed, c] for c in left_keys],
+                                            right_on=[right_keys.loc[right_keyed, c] for c in right_keys], how='outer')
+    matched = matched.drop(columns=[c for c in ('key_0', 'key_1') if c in matched.columns])
+    unkeyed = [frame for frame in (task_qem_df[~left_keyed], tables_df[~right_keyed]) if not frame.empty]
+    if not unkeyed:
+        return matched
+    logging.warning(f"{(~left_keyed).sum()} task rows and {(~right_keyed).sum()} table rows have no server/task key")
+    return pd.concat([matched, *unkeyed], ignore_index=True)
@@ -0,0 +1,118 @@
+# Base relations shared by the summary queries, built once per run from the typed data_df
+# (one row per task and table). Task-level relations have one row per task and settings combination,
+# with table_rows = the number of its data_df rows that carry a table_count (what TotalTables counts).
+# The state filter stays in the queries, so the same relations serve any set of states.
+
+# State filter of the queries: in_states(state_key, $states), with $states bound to a list of lowercase
+# QEM states, or to NULL for every state (tasks without a QEM state included)
+in_states_macro = """
+CREATE OR REPLACE MACRO in_states(state, states) AS states IS NULL OR list_contains(states, state)
+"""
+
+# Every task, table fan-out removed
+summary_tasks = """
+SELECT
+    replicate_server,
+    task_name,
+    task_name_key,
+    task_type_key,
+    state_key,
+    apply_changes_enabled,
+    store_changes_enabled,
+    logstream_parent_key,
+    source_server,
+    target_db_type,
+    target_server,
+    lob_max_size,
+    cdc_batch_min,
+    cdc_batch_max,
+    cdc_batch_memory_limit,
+    cdc_transaction_memory,
+    cdc_transaction_keep_time,
+    attrep_history_table,
+    attrep_status_table,
+    attrep_suspended_table,
+    cdc_when_source_table_dropped,
+    cdc_when_source_truncate,
+    cdc_when_source_ddl,
+    store_changes_handle_DDL,
+    error_policy_apply_conflicts,
+    delete_policy,
+    insert_policy,
+    update_policy,
+    COUNT(table_count) AS table_rows
+FROM data_df
+GROUP BY ALL
+"""
+
+# Replication tasks
+summary_replication_tasks = """
+SELECT *
+FROM summary_tasks
+WHERE task_type_key = 'replication'
+"""
+
+# LogStream staging tasks
+summary_logstream_tasks = """
+SELECT *
+FROM summary_tasks
+WHERE task_type_key = 'logstream'
+"""
+
+# Settings cube: replication tasks aggregated over every setting dimension the grouped sections report on,
+# at task granularity (one row per state, task name and settings; same-named tasks on several servers
+# collapse into one row, whose task_count counts them). The grouped sections are roll-ups of it:
+# COUNT(DISTINCT task_name) and SUM(table_rows) over the dimensions they group by.
+summary_settings_cube = """
+SELECT
+    state_key,
+    task_name,
+    target_db_type,
+    cdc_batch_min,
+    cdc_batch_max,
+    cdc_batch_memory_limit,
+    cdc_transaction_memory,
+    cdc_transaction_keep_time,
+    attrep_history_table,
+    attrep_status_table,
+    attrep_suspended_table,
+    lob_max_size,
+    cdc_when_source_table_dropped,
+    cdc_when_source_truncate,
+    cdc_when_source_ddl,
+    store_changes_handle_DDL,
+    error_policy_apply_conflicts,
+    delete_policy,
+    insert_policy,
+    update_policy,
+    COUNT(*) AS task_count,
+    CAST(SUM(table_rows) AS BIGINT) AS table_rows
+FROM summary_replication_tasks
+GROUP BY ALL
+"""
+
+# Table-level rows of the tasks that replicate changes (apply and/or store changes), LogStream tasks excluded
+summary_replicated_tables = """
+SELECT
+    replicate_server,
+    task_name,
+    state_key,
+    schema_name,
+    table_name,
+    source_server,
+    target_db_type,
+    target_server
+FROM data_df
+WHERE task_type_key NOT LIKE '%logstream%'
+  AND table_name IS NOT NULL
+  AND (apply_changes_enabled OR store_changes_enabled)
+"""
+
+# Creation order: later relations read the earlier ones
+BASE_RELATIONS = {
+    "summary_tasks": summary_tasks,
+    "summary_replication_tasks": summary_replication_tasks,
+    "summary_logstream_tasks": summary_logstream_tasks,
+    "summary_settings_cube": summary_settings_cube,
+    "summary_replicated_tables": summary_replicated_tables,
+}
@@ -0,0 +1,19 @@
+---
+title: Batch Tuning Summary
+notes: Summarizes batch tuning parameters like MIN, MAX, and Memory.
+order: 20
+names: batch_tuning
+---
+SELECT 
+   -- 'Batch Tuning' AS Description,
+    cdc_batch_min AS MinBatchTime,
+    cdc_batch_max AS MaxBatchTime,
+    cdc_batch_memory_limit AS BatchMemory,
+    COUNT(DISTINCT task_name) AS DistinctTaskCount,
+    CAST(SUM(table_rows) AS BIGINT) AS TotalTables
+FROM summary_settings_cube
+WHERE in_states(state_key, $states)
+GROUP BY 
+    cdc_batch_min,
+    cdc_batch_max,
+    cdc_batch_memory_limit;
@@ -0,0 +1,21 @@
+---
+title: Control Tables Usage
+notes: Displays the use of control tables.
+order: 40
+names: control_tables
+---
+SELECT 
+    --'Control Tables' AS Description,
+    attrep_history_table,
+    attrep_status_table,
+    attrep_suspended_table,
+    target_db_type,
+    COUNT(DISTINCT task_name) AS DistinctTaskCount,
+    CAST(SUM(table_rows) AS BIGINT) AS TotalTables
+FROM summary_settings_cube
+WHERE in_states(state_key, $states)
+GROUP BY 
+    attrep_history_table,
+    attrep_status_table,
+    attrep_suspended_table,
+    target_db_type;
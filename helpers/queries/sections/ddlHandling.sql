@@ -0,0 +1,23 @@
+---
+title: DDL Handling Policy
+notes: Shows how DDL operations are handled.
+order: 60
+names: ddl_handling
+---
+SELECT 
+    --'DDL Handling' AS Description,
+    target_db_type,
+    cdc_when_source_table_dropped,
+    cdc_when_source_truncate,
+    cdc_when_source_ddl AS cdc_when_source_ddl_altered,
+    store_changes_handle_DDL,
+    COUNT(DISTINCT task_name) AS DistinctTaskCount,
+    CAST(SUM(table_rows) AS BIGINT) AS TotalTables
+FROM summary_settings_cube
+WHERE in_states(state_key, $states)
+GROUP BY 
+    target_db_type,
+    cdc_when_source_table_dropped,
+    cdc_when_source_truncate,
+    cdc_when_source_ddl,
+    store_changes_handle_DDL;
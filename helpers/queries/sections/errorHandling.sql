@@ -0,0 +1,22 @@
+---
+title: Error Handling Policy
+notes: Lists error handling configuration.
+order: 80
+names: error_handling
+---
+SELECT 
+    --'Error Handling' AS Description,
+    target_db_type,
+    delete_policy,
+    insert_policy,
+    update_policy,
+    COUNT(DISTINCT task_name) AS DistinctTaskCount,
+    CAST(SUM(table_rows) AS BIGINT) AS TotalTables
+FROM summary_settings_cube
+WHERE in_states(state_key, $states)
+GROUP BY 
+    target_db_type,
+    delete_policy,
+    insert_policy,
+    update_policy,
+    error_policy_apply_conflicts;
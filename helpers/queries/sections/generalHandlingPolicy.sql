@@ -0,0 +1,17 @@
+---
+title: General Handling Policy
+notes: Displays general data handling policies.
+order: 70
+names: handling_policy
+---
+SELECT 
+    --'Server/Task Policy' AS Description,
+    target_db_type,
+    error_policy_apply_conflicts,
+    COUNT(DISTINCT task_name) AS DistinctTaskCount,
+    CAST(SUM(table_rows) AS BIGINT) AS TotalTables
+FROM summary_settings_cube
+WHERE in_states(state_key, $states)
+GROUP BY 
+    target_db_type,
+    error_policy_apply_conflicts;
@@ -0,0 +1,17 @@
+---
+title: LOB Size Summary
+notes: Lists configuration for Large Object sizes.
+order: 50
+names: lob_size
+---
+SELECT 
+    --'LOB' AS Description,
+    lob_max_size,
+    target_db_type,
+    COUNT(DISTINCT task_name) AS DistinctTaskCount,
+    CAST(SUM(table_rows) AS BIGINT) AS TotalTables
+FROM summary_settings_cube
+WHERE in_states(state_key, $states)
+GROUP BY 
+    lob_max_size,
+    target_db_type;
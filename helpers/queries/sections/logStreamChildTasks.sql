@@ -0,0 +1,27 @@
+---
+title: LogStream Child Task Summary
+notes: Shows the number of child tasks under each log stream.
+order: 90
+names: totalChildTasksForEachParent
+---
+WITH unique_logstreams AS (
+    SELECT DISTINCT task_name AS logstream_task_name,
+           task_name_key AS logstream_key
+    FROM summary_logstream_tasks
+    WHERE in_states(state_key, $states)
+),
+unique_running_replications AS (
+    SELECT DISTINCT task_name AS replication_task_name,
+           logstream_parent_key AS parent_logstream
+    FROM summary_replication_tasks
+    WHERE in_states(state_key, $states)
+)
+
+SELECT 
+    ul.logstream_task_name AS LogStreamTask,
+    COUNT(ur.replication_task_name) AS RunningReplicationTaskCount
+FROM unique_logstreams AS ul
+LEFT JOIN unique_running_replications AS ur
+    ON ur.parent_logstream = ul.logstream_key
+GROUP BY ul.logstream_task_name
+ORDER BY RunningReplicationTaskCount DESC;
@@ -0,0 +1,26 @@
+---
+title: LogStream tasks with NO Child/Replication tasks
+notes: Lists of all Running LogStream tasks with NO Child/Replicate tasks.
+order: 130
+names: losgtreamwithNoChild
+---
+WITH unique_logstreams AS (
+    SELECT DISTINCT task_name AS logstream_task_name,
+           task_name_key AS logstream_key
+    FROM summary_logstream_tasks
+    WHERE in_states(state_key, $states)
+),
+unique_running_replications AS (
+    SELECT DISTINCT logstream_parent_key AS parent_logstream
+    FROM summary_replication_tasks
+    WHERE in_states(state_key, $states)
+)
+
+-- Select LogStreams that are NOT used as a parent
+SELECT logstream_task_name
+FROM unique_logstreams
+WHERE logstream_key NOT IN (
+    SELECT parent_logstream
+    FROM unique_running_replications
+    WHERE parent_logstream IS NOT NULL
+);
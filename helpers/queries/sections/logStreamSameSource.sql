@@ -0,0 +1,30 @@
+---
+title: Multiple LogStream Connecting to Same Source Server
+notes: Shows the number of LogStream tasks connecting to same source database.
+order: 100
+names: multipleLogStreamSameSourceDB
+---
+WITH logstream_tasks AS (
+    SELECT DISTINCT
+        task_name,
+        source_server,
+        replicate_server
+    FROM summary_logstream_tasks
+    WHERE in_states(state_key, $states)
+),
+source_server_counts AS (
+    SELECT 
+        source_server
+    FROM logstream_tasks
+    GROUP BY source_server
+    HAVING COUNT(*) > 1
+)
+
+SELECT 
+    lt.task_name AS TaskName,
+    lt.replicate_server AS ReplicateServer,
+    lt.source_server AS SourceServer
+FROM logstream_tasks AS lt
+JOIN source_server_counts AS ssc
+    ON lt.source_server = ssc.source_server
+ORDER BY lt.source_server, lt.task_name;
@@ -0,0 +1,73 @@
+---
+title: Running Tasks Summary
+notes: Provides counts of all tasks grouped by type and status.
+order: 10
+names: total_tasks_query, running_tasks_query, replication_tasks_query, logstream_tasks_query, apply_changes_query, store_changes_query, apply_store_changes_query, no_logstream_query
+---
+-- 1. Total Number of Tasks
+SELECT 
+    'Total Tasks' AS Description,
+    COUNT(DISTINCT task_name) AS DistinctTaskCount,
+    CAST(COALESCE(SUM(table_rows), 0) AS BIGINT) AS TotalTables
+FROM summary_tasks;
+
+-- 2. Total Running State Tasks
+SELECT 
+    'Running State Tasks' AS Description,
+    COUNT(DISTINCT task_name) AS DistinctTaskCount,
+    CAST(COALESCE(SUM(table_rows), 0) AS BIGINT) AS TotalTables
+FROM summary_tasks
+WHERE in_states(state_key, $states);
+
+-- 3.1 Total Replication Tasks
+SELECT 
+    'Replication Tasks' AS Description,
+    COUNT(DISTINCT task_name) AS DistinctTaskCount,
+    CAST(COALESCE(SUM(table_rows), 0) AS BIGINT) AS TotalTables
+FROM summary_replication_tasks
+WHERE in_states(state_key, $states);
+
+-- 3. Total LogStream Tasks
+SELECT 
+    'LogStream Tasks' AS Description,
+    COUNT(DISTINCT task_name) AS DistinctTaskCount,
+    CAST(COALESCE(SUM(table_rows), 0) AS BIGINT) AS TotalTables
+FROM summary_logstream_tasks
+WHERE in_states(state_key, $states);
+
+-- 4. Total Apply Changes Tasks
+SELECT 
+    'Apply Changes(Only) Tasks' AS Description,
+    COUNT(DISTINCT task_name) AS DistinctTaskCount,
+    CAST(COALESCE(SUM(table_rows), 0) AS BIGINT) AS TotalTables
+FROM summary_tasks
+WHERE (apply_changes_enabled AND NOT store_changes_enabled) AND
+in_states(state_key, $states);
+
+-- 5. Total Store Changes Tasks
+SELECT 
+    'Store Changes(Only) Tasks' AS Description,
+    COUNT(DISTINCT task_name) AS DistinctTaskCount,
+    CAST(COALESCE(SUM(table_rows), 0) AS BIGINT) AS TotalTables
+FROM summary_tasks
+WHERE (store_changes_enabled AND NOT apply_changes_enabled) AND
+in_states(state_key, $states);
+
+-- 6. Total Apply and Store Changes Tasks
+SELECT 
+    'Apply and Store Changes Tasks' AS Description,
+    COUNT(DISTINCT task_name) AS DistinctTaskCount,
+    CAST(COALESCE(SUM(table_rows), 0) AS BIGINT) AS TotalTables
+FROM summary_tasks
+WHERE apply_changes_enabled AND store_changes_enabled AND
+in_states(state_key, $states);
+
+-- 7. Total Tasks without LogStream
+SELECT 
+    'Tasks without LogStream' AS Description,
+    COUNT(DISTINCT task_name) AS DistinctTaskCount,
+    CAST(COALESCE(SUM(table_rows), 0) AS BIGINT) AS TotalTables
+FROM summary_replication_tasks
+WHERE logstream_parent_key IS NULL AND
+in_states(state_key, $states) AND
+(apply_changes_enabled OR store_changes_enabled);
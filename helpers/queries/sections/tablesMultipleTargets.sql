@@ -0,0 +1,35 @@
+---
+title: Replication of the same Table to Multiple Targets with different Replicate servers
+notes: Lists of Tables replicate more than once to the same or more target Databases and are hosted on different Replicate servers.
+order: 110
+names: duplicate_replication_multiple_targets_with_diff_replicate_server
+---
+WITH DuplicateEntries AS (
+    SELECT 
+        "table_name",
+        "schema_name",
+        "source_server",
+        COUNT(*) AS DuplicateCount
+    FROM summary_replicated_tables
+    WHERE in_states("state_key", $states)
+    GROUP BY 
+        table_name,
+        schema_name,
+        source_server
+    HAVING 
+        -- same as COUNT(DISTINCT "replicate_server") > 1, without a set of servers per table
+        COUNT(*) > 1 AND MIN("replicate_server") <> MAX("replicate_server")
+)
+
+SELECT 
+    md."replicate_server",
+    md."table_name",
+    md."task_name",
+    de.DuplicateCount
+FROM summary_replicated_tables md
+JOIN DuplicateEntries de ON 
+    md."table_name" = de.table_name AND 
+    md."schema_name" = de.schema_name AND 
+    md."source_server" = de.source_server
+WHERE in_states(md."state_key", $states)
+ORDER BY md."table_name", md."replicate_server", md."task_name";
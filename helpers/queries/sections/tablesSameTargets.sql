@@ -0,0 +1,47 @@
+---
+title: Replication of same Table to Same Targets
+notes: Lists of Tables replicate more than once to same target DB's.
+order: 120
+names: duplicate_replication_same_targets
+---
+WITH DuplicateEntries AS (
+    SELECT 
+        "table_name" AS table_name,
+        "schema_name" AS schema_name,
+        "source_server" AS source_server,
+        "target_db_type" AS target_db_type,
+        "target_server" AS target_server,
+        COUNT(*) AS DuplicateCount
+    FROM summary_replicated_tables
+    WHERE in_states("state_key", $states)
+    GROUP BY 
+        table_name,
+        schema_name,
+        source_server,
+        target_db_type,
+        target_server
+    HAVING 
+        COUNT(*) > 1
+)
+
+SELECT 
+    md."replicate_server",
+    md."task_name",
+    md."table_name",
+    COUNT(*) OVER (
+        PARTITION BY 
+            md."table_name", 
+            md."schema_name", 
+            md."source_server", 
+            md."target_db_type", 
+            md."target_server"
+    ) AS TotalOccurrences
+FROM summary_replicated_tables md
+JOIN DuplicateEntries de ON 
+    md."table_name" = de.table_name AND 
+    md."schema_name" = de.schema_name AND 
+    md."source_server" = de.source_server AND
+COALESCE(md."target_db_type", '') = COALESCE(de."target_db_type", '') AND
+COALESCE(md."target_server", '') = COALESCE(de."target_server", '')
+WHERE in_states(md."state_key", $states)
+ORDER BY md."table_name";
@@ -0,0 +1,17 @@
+---
+title: Transaction Offloading Summary
+notes: Shows memory settings for transaction offloading.
+order: 30
+names: transaction_memory
+---
+SELECT 
+    --'Transaction mem offloading' AS Description,
+    cdc_transaction_memory AS CDCTransactionMemory,
+    cdc_transaction_keep_time AS CDCTransactionKeepTime,
+    COUNT(DISTINCT task_name) AS DistinctTaskCount,
+    CAST(SUM(table_rows) AS BIGINT) AS TotalTables
+FROM summary_settings_cube
+WHERE in_states(state_key, $states)
+GROUP BY 
+    cdc_transaction_memory,
+    cdc_transaction_keep_time;
@@ -0,0 +1,83 @@
+import os
+import re
+import glob
+import duckdb
+from helpers.logger_config import setup_logger
+
+logging = setup_logger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Sections shipped with the extractor; EXTRACTOR_QUERY_DIRS (os.pathsep-separated) adds or overrides sections
+BUILTIN_QUERY_DIR = os.path.join(BASE_DIR, "queries", "sections")
+QUERY_DIRS = [BUILTIN_QUERY_DIR] + [d for d in (os.getenv("EXTRACTOR_QUERY_DIRS") or "").split(os.pathsep) if d]
+
+# ---
+# title: Batch Tuning Summary
+# notes: Summarizes batch tuning parameters like MIN, MAX, and Memory.
+# order: 20
+# names: batch_tuning
+# ---
+FRONT_MATTER_PATTERN = re.compile(r"\A---[ \t]*\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|\Z)", re.S)
+
+
+def parse_section_file(path):
+    """
+    Reads one section file: front-matter (title, notes, order, names) followed by one or more SQL statements
+    whose results are stacked into the section's table. Returns (title, section), the section holding
+    'queries', 'names' (one per query: the front-matter names, else the file stem), 'notes', 'order' and 'source'.
+    """
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    match = FRONT_MATTER_PATTERN.match(text)
+    if match is None:
+        raise ValueError("missing '---' front-matter")
+    fields = {}
+    for line in match.group(1).splitlines():
+        if line.strip() and not line.lstrip().startswith("#"):
+            key, sep, value = line.partition(":")
+            if not sep:
+                raise ValueError(f"front-matter line is not 'key: value': {line!r}")
+            fields[key.strip().lower()] = value.strip()
+    if not fields.get("title"):
+        raise ValueError("front-matter has no title")
+
+    queries = [statement.query.strip().rstrip(";").rstrip() for statement in duckdb.extract_statements(text[match.end():])]
+    if not queries:
+        raise ValueError("no SQL statement")
+    stem = os.path.splitext(os.path.basename(path))[0]
+    names = [n.strip() for n in fields.get("names", "").split(",") if n.strip()]
+    if not names:
+        names = [stem] if len(queries) == 1 else [f"{stem}_{i}" for i in range(1, len(queries) + 1)]
+    if len(names) != len(queries):
+        raise ValueError(f"{len(names)} names for {len(queries)} statements")
+    return fields["title"], {
+        "queries": queries,
+        "names": names,
+        "notes": fields.get("notes", ""),
+        "order": float(fields.get("order") or 0),
+        "source": path,
+    }
+
+
+def load_sections(query_dirs=None):
+    """
+    Discovers the summary sections in the *.sql files of query_dirs (default QUERY_DIRS) and returns them
+    in document order (front-matter order, then title) as title -> section. A section of a later directory
+    replaces an earlier section with the same title. Files that cannot be parsed are logged and skipped.
+    """
+    sections = {}
+    for query_dir in query_dirs or QUERY_DIRS:
+        paths = sorted(glob.glob(os.path.join(query_dir, "*.sql")))
+        if not paths:
+            logging.warning(f"No summary query files in {query_dir}")
+        for path in paths:
+            try:
+                title, section = parse_section_file(path)
+            except (ValueError, duckdb.Error) as e:
+                logging.error(f"Skipping summary query file {path}: {e}")
+                continue
+            if title in sections:
+                logging.info(f"Summary section '{title}' overridden by {path}")
+            sections[title] = section
+    return dict(sorted(sections.items(), key=lambda item: (item[1]["order"], item[0])))
@@ -0,0 +1,68 @@
+import os
+import duckdb
+import pyarrow as pa
+from helpers.logger_config import setup_logger
+from helpers.utils import prepare_for_parquet
+from helpers.starSchema import FLAT_VIEWS_SQL
+from helpers import summary
+from helpers.queries.baseRelations import BASE_RELATIONS, in_states_macro
+
+logging = setup_logger(__name__)
+
+# Schemas holding one view per summary query (helpers/queries), running tasks only / every QEM state
+REPORT_SCHEMA = "report"
+REPORT_ALL_STATES_SCHEMA = "report_all_states"
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def report_views_sql():
+    """
+    Builds the view definitions for the summary queries: report.<query name> filters on running tasks
+    like the Word summary does, report_all_states.<query name> keeps every QEM state.
+    """
+    statements = [f"CREATE SCHEMA IF NOT EXISTS {REPORT_SCHEMA};",
+                  f"CREATE SCHEMA IF NOT EXISTS {REPORT_ALL_STATES_SCHEMA};"]
+    for _, name, query in summary.summary_queries():
+        for schema, include_all_states in ((REPORT_SCHEMA, False), (REPORT_ALL_STATES_SCHEMA, True)):
+            states = summary.states_literal(summary.summary_states(include_all_states))
+            body = query.replace("$states", states).strip().rstrip(";")
+            statements.append(f"CREATE OR REPLACE VIEW {schema}.{_quote(name)} AS\n{body};")
+    return "\n".join(statements)
+
+
+def write_run_database(db_path, tables, star=False):
+    """
+    Writes the run's frames into one DuckDB file as typed tables (same typing as the Parquet output),
+    then adds the data_df view the summary queries read (flat_export with the summary columns typed,
+    see summary.summary_data_sql), the base relations the report queries share and the report views.
+
+    tables maps table name -> DataFrame. For the flat layout it must contain 'flat_export' (the merged
+    export); for the star layout (star=True) the keyed tables, from which task_qem_merge and flat_export
+    are created as views. Frames without columns are skipped.
+    """
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    con = duckdb.connect(db_path)
+    try:
+        for name, df in tables.items():
+            if df is None or df.shape[1] == 0:
+                continue
+            con.register("run_frame", pa.Table.from_pandas(prepare_for_parquet(df), preserve_index=False))
+            con.execute(f"CREATE TABLE {_quote(name)} AS SELECT * FROM run_frame")
+            con.unregister("run_frame")
+        if star:
+            con.execute(FLAT_VIEWS_SQL)
+        flat_columns = [row[0] for row in con.execute("DESCRIBE flat_export").fetchall()]
+        con.execute(f"CREATE OR REPLACE VIEW data_df AS {summary.summary_data_sql('flat_export', flat_columns)}")
+        con.execute(in_states_macro)
+        for name, query in BASE_RELATIONS.items():
+            con.execute(f"CREATE OR REPLACE VIEW {name} AS {query}")
+        con.execute(report_views_sql())
+        con.execute("CHECKPOINT")
+    finally:
+        con.close()
+    logging.info(f"Wrote run database with {len(tables)} tables: {db_path}")
+    return db_path
@@ -0,0 +1,130 @@
+import os
+import sys
+import json
+import time
+import threading
+from datetime import datetime
+from helpers.cache import file_hash
+from helpers.logger_config import setup_logger
+
+logging = setup_logger(__name__)
+
+try:
+    import resource
+except ImportError:  # Windows: peak memory is not reported
+    resource = None
+
+# Bump when the manifest layout changes so consumers can tell the versions apart
+MANIFEST_VERSION = 1
+
+
+def peak_memory_bytes():
+    """Peak resident set size of this process so far, or None where the platform does not report it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # kilobytes on Linux, bytes on macOS
+
+
+class RunManifest:
+    """
+    Machine-readable record of one run, written as run_manifest_<timestamp>.json next to the artifacts.
+
+    Pipeline stages are timed with lap(): each call records the wall time and the CPU time of the calling
+    thread since the previous lap. Artifacts are recorded with add_artifact() right after they are written
+    (on the writer thread), which reads back their size and SHA-256 so consumers never have to open them.
+    """
+
+    def __init__(self, output_dir, run_id, options=None, inputs=None):
+        self.output_dir = output_dir
+        self.run_id = run_id
+        self.options = options or {}
+        self.inputs = inputs or {}
+        self.created_at = datetime.now().isoformat(timespec="seconds")
+        self.stages = {}
+        self.artifacts = {}
+        self.summary_sections = []
+        self._lock = threading.Lock()
+        self._run_wall = self._lap_wall = time.perf_counter()
+        self._run_cpu = time.process_time()
+        self._lap_cpu = time.thread_time()
+
+    def lap(self, stage):
+        """Records the time spent in `stage` since the previous lap (or since the manifest was created)."""
+        wall, cpu = time.perf_counter(), time.thread_time()
+        self.add_stage(stage, wall - self._lap_wall, cpu - self._lap_cpu)
+        self._lap_wall, self._lap_cpu = wall, cpu
+
+    def add_stage(self, stage, wall_seconds, cpu_seconds):
+        with self._lock:
+            timing = self.stages.setdefault(stage, {"wall_seconds": 0.0, "cpu_seconds": 0.0})
+            timing["wall_seconds"] += wall_seconds
+            timing["cpu_seconds"] += cpu_seconds
+
+    def add_artifact(self, key, path, stage, rows=None, job=None):
+        """Records a written file under its output key, with its size, content hash and producing stage."""
+        entry = {
+            "key": key,
+            "path": os.path.relpath(path, self.output_dir),
+            "size_bytes": os.path.getsize(path),
+            "rows": rows,
+            "sha256": file_hash(path),
+            "stage": stage,
+            "job": job,
+        }
+        with self._lock:
+            self.artifacts[entry["path"]] = entry
+
+    def add_output_stage(self, output_stage):
+        """
+        Copies the output stage's per-write wall/CPU times onto the artifacts and adds an 'output' stage.
+        Stages that only run as output jobs (summary, run_database, workbook) get their jobs' times.
+        """
+        lapped = set(self.stages)
+        for entry in self.artifacts.values():
+            job = entry.get("job")
+            if job in output_stage.timings:
+                entry["write_seconds"] = round(output_stage.timings[job], 4)
+                entry["write_cpu_seconds"] = round(output_stage.cpu_timings[job], 4)
+                if entry["stage"] not in lapped:
+                    self.add_stage(entry["stage"], output_stage.timings[job], output_stage.cpu_timings[job])
+        self.add_stage("output", output_stage.wall_seconds or 0.0, sum(output_stage.cpu_timings.values()))
+
+    def add_summary_sections(self, summary_tables):
+        """
+        Records the wall time, row count and cache use of each summary section (see build_summary_tables),
+        and the per-query timings and EXPLAIN ANALYZE plans of profiled runs under 'queries'.
+        """
+        self.summary_sections = []
+        for section in summary_tables:
+            entry = {"title": section["title"], "rows": len(section["df"]),
+                     "seconds": round(section.get("seconds") or 0.0, 4), "cached": bool(section.get("cached"))}
+            if section.get("profiles"):
+                entry["queries"] = [dict(profile, seconds=round(profile["seconds"], 4))
+                                    for profile in section["profiles"]]
+            self.summary_sections.append(entry)
+
+    def to_dict(self):
+        return {
+            "manifest_version": MANIFEST_VERSION,
+            "run_id": self.run_id,
+            "created_at": self.created_at,
+            "output_dir": os.path.abspath(self.output_dir),
+            "options": self.options,
+            "inputs": self.inputs,
+            "wall_seconds": round(time.perf_counter() - self._run_wall, 4),
+            "cpu_seconds": round(time.process_time() - self._run_cpu, 4),
+            "peak_memory_bytes": peak_memory_bytes(),
+            "stages": {name: {k: round(v, 4) for k, v in timing.items()} for name, timing in self.stages.items()},
+            "artifacts": sorted(self.artifacts.values(), key=lambda entry: entry["path"]),
+            "summary_sections": self.summary_sections,
+        }
+
+    def write(self, manifest_path):
+        """Writes the manifest as JSON (atomically, so a reader never sees a partial file) and returns its path."""
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, manifest_path)
+        logging.info(f"Wrote run manifest: {manifest_path}")
+        return manifest_path
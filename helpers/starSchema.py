@@ -0,0 +1,166 @@
+import os
+import duckdb
+import pandas as pd
+from helpers.logger_config import setup_logger
+from helpers.qemIndex import normalize_key, normalize_server_key
+from databases.tasks.retrieveTaskSettings import TASK_SETTINGS_COLUMNS
+
+logging = setup_logger(__name__)
+
+# Columns contributed by the source extractors; every other non-task column comes from a target extractor
+SOURCE_PREFIXES = ("source_", "src_", "backend_db_")
+
+# Star tables written per run, in load order
+STAR_TABLES = ("tasks", "source_endpoints", "target_endpoints", "qem", "tables")
+
+# Repository-level server tables referenced by the views (written by the regular output stage)
+SERVER_TABLES = {
+    "server_settings": "servers",
+    "server_schedules": "server_schedules",
+    "notifications": "server_notifications",
+}
+
+FLAT_VIEWS_SQL = """
+-- Reproduces task_settings_qem_merge_*.csv (one row per task)
+CREATE OR REPLACE VIEW task_qem_keyed AS
+SELECT t.* EXCLUDE (source_endpoint_id, target_endpoint_id, qem_id),
+       s.* EXCLUDE (source_endpoint_id),
+       g.* EXCLUDE (target_endpoint_id),
+       q.* EXCLUDE (qem_id)
+FROM tasks t
+LEFT JOIN source_endpoints s ON t.source_endpoint_id = s.source_endpoint_id
+LEFT JOIN target_endpoints g ON t.target_endpoint_id = g.target_endpoint_id
+LEFT JOIN qem q ON t.qem_id = q.qem_id;
+
+CREATE OR REPLACE VIEW task_qem_merge AS
+SELECT * EXCLUDE (task_id) FROM task_qem_keyed;
+
+-- Reproduces exportRepositoryCSV_*.csv (tasks x tables fan-out, outer join)
+CREATE OR REPLACE VIEW flat_export AS
+SELECT k.* EXCLUDE (task_id), tb.* EXCLUDE (task_id)
+FROM task_qem_keyed k
+FULL OUTER JOIN tables tb ON k.task_id = tb.task_id;
+"""
+
+
+def _dimension(frame, id_col):
+    """
+    De-duplicates the rows of frame into a dimension table.
+    Returns (ids aligned with frame, dimension DataFrame with id_col first).
+    """
+    if frame.shape[1] == 0:
+        return pd.array([0] * len(frame), dtype="Int64"), pd.DataFrame({id_col: [0]})
+    ids = frame.groupby(list(frame.columns), dropna=False, sort=False).ngroup()
+    dimension = frame.assign(**{id_col: ids.values}).drop_duplicates(id_col)
+    dimension = dimension[[id_col] + list(frame.columns)].reset_index(drop=True)
+    return ids.values, dimension
+
+
+def build_star_schema(task_df, qem_df, qem_positions, tables_df):
+    """
+    Splits the task x QEM x tables data into keyed tables instead of the fan-out outer merge:
+
+      tasks             one row per task (task settings) with task_id, source/target endpoint ids and qem_id
+      source_endpoints  de-duplicated source endpoint settings
+      target_endpoints  de-duplicated target endpoint settings
+      qem               QEM export rows with qem_id
+      tables            table rows with the task_id they belong to (null when the task is unknown)
+
+    qem_positions are the QEM row positions matched for each task (QemIndex.match).
+    Raises ValueError when two tasks share a normalized (server, task) key, since their table rows could
+    not be told apart.
+    """
+    task_cols = [c for c in task_df.columns if c in TASK_SETTINGS_COLUMNS]
+    endpoint_cols = [c for c in task_df.columns if c not in TASK_SETTINGS_COLUMNS]
+    source_cols = [c for c in endpoint_cols if c.startswith(SOURCE_PREFIXES)]
+    target_cols = [c for c in endpoint_cols if c not in source_cols]
+
+    tasks = task_df[task_cols].reset_index(drop=True)
+    tasks.insert(0, "task_id", range(len(tasks)))
+
+    source_ids, source_endpoints = _dimension(task_df[source_cols].reset_index(drop=True), "source_endpoint_id")
+    target_ids, target_endpoints = _dimension(task_df[target_cols].reset_index(drop=True), "target_endpoint_id")
+    tasks["source_endpoint_id"] = source_ids
+    tasks["target_endpoint_id"] = target_ids
+    tasks["qem_id"] = pd.array(qem_positions, dtype="Int64")
+
+    qem = qem_df.reset_index(drop=True)
+    qem.insert(0, "qem_id", range(len(qem)))
+
+    task_keys = list(zip(tasks["json_file_name"].map(normalize_server_key), tasks["task_name"].map(normalize_key)))
+    keyed = [(key, task_id) for key, task_id in zip(task_keys, tasks["task_id"]) if None not in key]
+    task_ids = dict(keyed)
+    if len(task_ids) != len(keyed):
+        counts = pd.Series([key for key, _ in keyed]).value_counts()
+        collisions = ", ".join(f"{server}/{task}" for server, task in counts[counts > 1].index[:10])
+        raise ValueError(f"Several tasks share a (server, task) key, table rows cannot be keyed: {collisions}")
+    tables = tables_df.reset_index(drop=True)
+    if tables.empty:
+        tables = pd.DataFrame({"task_id": pd.array([], dtype="Int64")})
+    else:
+        keys = zip(tables["tables_json_file_name"].map(normalize_server_key),
+                   tables["tables_task_name"].map(normalize_key))
+        tables.insert(0, "task_id", pd.array([task_ids.get(k) for k in keys], dtype="Int64"))
+
+    logging.info(f"Star schema: {len(tasks)} tasks, {len(source_endpoints)} source endpoints, "
+                 f"{len(target_endpoints)} target endpoints, {len(qem)} QEM rows, {len(tables)} table rows")
+    return {
+        "tasks": tasks,
+        "source_endpoints": source_endpoints,
+        "target_endpoints": target_endpoints,
+        "qem": qem,
+        "tables": tables,
+    }
+
+
+def _read_expression(path, partitioned=False):
+    """
+    DuckDB table function reading one artifact, matching how it was written. CSVs are read as text, like
+    the flat path reads them, so values such as 'True' or 'NA' keep their spelling. Partitioned artifacts
+    (a directory of <column>=<value>/part-0.* files) are read as one Hive-partitioned table, so
+    filters on the partition column only open the matching files.
+    """
+    is_parquet = path.endswith(".parquet")
+    path = os.path.abspath(path).replace("\\", "/").replace("'", "''")
+    options = ""
+    if partitioned:
+        path += "/*/*"
+        options = ", hive_partitioning=true, union_by_name=true"
+    if is_parquet:
+        return f"read_parquet('{path}'{options})"
+    return f"read_csv('{path}', header=true, all_varchar=true{options})"
+
+
+def star_views_sql(table_paths, partitioned=()):
+    """
+    Builds the DuckDB script that exposes the star tables as views and reproduces the old flat
+    outputs (task_qem_merge, flat_export) on demand. table_paths maps view name -> artifact path;
+    paths listed in partitioned are partitioned artifact directories.
+    """
+    lines = ["-- Star schema views. Load with: duckdb my.db < this_file.sql  (or .read this_file.sql)"]
+    for name, path in table_paths.items():
+        if path:
+            lines.append(f"CREATE OR REPLACE VIEW {name} AS SELECT * FROM {_read_expression(path, path in partitioned)};")
+    lines.append(FLAT_VIEWS_SQL)
+    return "\n".join(lines)
+
+
+def write_views(table_paths, views_path, partitioned=()):
+    """Writes the views script next to the star tables and returns its path."""
+    with open(views_path, 'w', encoding='utf-8') as f:
+        f.write(star_views_sql(table_paths, partitioned))
+    logging.info(f"Wrote star schema views: {views_path}")
+    return views_path
+
+
+def load_flat_export(views_path, con=None, columns=None):
+    """
+    Runs the views script on a DuckDB connection and returns the flat_export view as a DataFrame,
+    keeping only the listed columns (selected in DuckDB, so the others are never materialized).
+    """
+    con = con or duckdb.connect()
+    with open(views_path, 'r', encoding='utf-8') as f:
+        con.execute(f.read())
+    available = [row[0] for row in con.execute("DESCRIBE flat_export").fetchall()]
+    selected = ['"' + c.replace('"', '""') + '"' for c in available if columns is None or c in columns]
+    return con.execute(f"SELECT {', '.join(selected)} FROM flat_export").df()
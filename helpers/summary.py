@@ -1,10 +1,20 @@
+import re
+import glob
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import duckdb
-from helpers.queries import tasksCounts, changeProcessTuning, handlingPolicy, logStream, tablesData
+import pyarrow as pa
+import pyarrow.parquet as pq
+from helpers.summaryCache import SummaryCache
+from helpers.queryPlugins import load_sections
+from helpers.queries.baseRelations import BASE_RELATIONS, in_states_macro
 import os
 from helpers.logger_config import setup_logger
 from helpers.docx.docCreation import export_tables_to_word
-from helpers.utils import apply_state_filter  # Your helper from Option 1
+from helpers.utils import prepare_for_parquet
+from helpers.starSchema import load_flat_export
 
 # Configure Logging
 logging = setup_logger(__name__)
@@ -12,122 +22,395 @@ logging = setup_logger(__name__)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 logo_path = os.path.join(BASE_DIR, "docx", "QlikNewLogo.png")
 
-def read_csv(path):
-    """Read CSV file into a Pandas DataFrame."""
+# Summary sections in document order: title -> queries run against data_df, their names and the notes shown
+# under the table. Discovered from the *.sql files of helpers/queries/sections and EXTRACTOR_QUERY_DIRS.
+SUMMARY_SECTIONS = load_sections()
+
+# The settings cube (see helpers/queries/baseRelations.py) as written out for ad-hoc slicing; every state is kept
+SETTINGS_CUBE_QUERY = "SELECT * FROM summary_settings_cube ORDER BY ALL"
+
+# QEM states the summary covers unless told otherwise
+DEFAULT_STATES = ("running",)
+
+# DuckDB limits of each summary connection (empty: DuckDB defaults, i.e. all cores and 80% of RAM)
+SUMMARY_DUCKDB_THREADS = int(os.getenv("EXTRACTOR_SUMMARY_THREADS") or 0) or None
+SUMMARY_DUCKDB_MEMORY_LIMIT = os.getenv("EXTRACTOR_SUMMARY_MEMORY_LIMIT") or None
+
+# Sections run at the same time, each on its own cursor of the run's connection (1: one after another)
+SUMMARY_SECTION_WORKERS = int(os.getenv("EXTRACTOR_SUMMARY_SECTION_WORKERS") or 0) or min(4, os.cpu_count() or 1)
+
+# Identifiers referenced by the section queries; used to read only these columns from Parquet
+SQL_IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+# 'enable'/'Enable' -> TRUE, 'disable'/'Disable' -> FALSE, anything else -> NULL
+_FLAG = "CASE WHEN LOWER(CAST({0} AS VARCHAR)) LIKE '%disable%' THEN FALSE WHEN LOWER(CAST({0} AS VARCHAR)) LIKE '%enable%' THEN TRUE END"
+_TEXT = "CAST({0} AS VARCHAR)"
+_NAME = "TRIM(CAST({0} AS VARCHAR))"
+_KEY = "LOWER(TRIM(CAST({0} AS VARCHAR)))"
+_INTEGER = "TRY_CAST({0} AS INTEGER)"
+
+# Types of the data_df columns the summary queries read: data_df column -> (source column, SQL expression).
+# They are applied once when data_df is created, so the queries compare and group typed columns and
+# lowercase keys instead of casting and lowercasing every row on every scan.
+SUMMARY_COLUMN_TYPES = {
+    "table_count": ("table_count", _INTEGER),
+    "cdc_batch_min": ("cdc_batch_min", _INTEGER),
+    "cdc_batch_max": ("cdc_batch_max", _INTEGER),
+    "cdc_batch_memory_limit": ("cdc_batch_memory_limit", _INTEGER),
+    "cdc_transaction_memory": ("cdc_transaction_memory", _INTEGER),
+    "cdc_transaction_keep_time": ("cdc_transaction_keep_time", _INTEGER),
+    # Size in KB, or the 'UnlimitedLob' label
+    "lob_max_size": ("lob_max_size", "COALESCE(CAST(TRY_CAST({0} AS INTEGER) AS VARCHAR), CAST({0} AS VARCHAR))"),
+    "target_db_type": ("target_db_type", _TEXT),
+    "target_server": ("target_server", _TEXT),
+    "attrep_history_table": ("attrep_history_table", _TEXT),
+    "attrep_status_table": ("attrep_status_table", _TEXT),
+    "attrep_suspended_table": ("attrep_suspended_table", _TEXT),
+    "cdc_when_source_table_dropped": ("cdc_when_source_table_dropped", _TEXT),
+    "cdc_when_source_truncate": ("cdc_when_source_truncate", _TEXT),
+    "cdc_when_source_ddl": ("cdc_when_source_ddl", _TEXT),
+    "store_changes_handle_DDL": ("store_changes_handle_DDL", _TEXT),
+    "error_policy_apply_conflicts": ("error_policy_apply_conflicts", _TEXT),
+    "delete_policy": ("delete_policy", _TEXT),
+    "insert_policy": ("insert_policy", _TEXT),
+    "update_policy": ("update_policy", _TEXT),
+    "schema_name": ("schema_name", _TEXT),
+    "table_name": ("table_name", _TEXT),
+    "task_name": ("task_name", _NAME),
+    "replicate_server": ("replicate_server", _NAME),
+    "source_server": ("source_server", _NAME),
+    # Lowercase keys and flags derived from the raw settings
+    "task_name_key": ("task_name", _KEY),
+    "task_type_key": ("task_type", _KEY),
+    "state_key": ("qem_State", _KEY),
+    "logstream_parent_key": ("source_logstreamstagingtask", "NULLIF(" + _KEY + ", 'none')"),
+    "apply_changes_enabled": ("apply_changes", _FLAG),
+    "store_changes_enabled": ("store_changes", _FLAG),
+}
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def summary_columns(sections=None):
+    """
+    Returns the set of identifiers used in the section queries plus the source columns of the typed
+    data_df columns (a superset of the columns the summary needs from the merged export).
+    """
+    sections = sections or SUMMARY_SECTIONS
+    names = {name for content in sections.values() for q in content["queries"] for name in SQL_IDENTIFIER_PATTERN.findall(q)}
+    return names | {source for source, _ in SUMMARY_COLUMN_TYPES.values()}
+
+
+def summary_data_sql(relation, columns):
+    """
+    Builds the SELECT that turns the raw merged rows of `relation` (whose columns are `columns`) into
+    the typed data_df the summary queries read: the columns of SUMMARY_COLUMN_TYPES are cast or derived,
+    every other column is passed through. Typed columns whose source is missing are typed NULLs. Running it on
+    an already typed data_df gives the same relation back.
+    """
+    available = set(columns)
+    selects = [_quote(c) for c in columns if c not in SUMMARY_COLUMN_TYPES]
+    for name, (source, expression) in SUMMARY_COLUMN_TYPES.items():
+        value = expression.format(_quote(source) if source in available else "NULL")
+        selects.append(f"{value} AS {_quote(name)}")
+    return "SELECT\n    " + ",\n    ".join(selects) + f"\nFROM {relation}"
+
+
+def summary_queries(sections=None):
+    """
+    Yields (section title, query name, query) for every summary query, in document order.
+    Query names come from the section files' front-matter (e.g. 'batch_tuning').
+    """
+    for title, content in (sections or SUMMARY_SECTIONS).items():
+        for name, query in zip(content["names"], content["queries"]):
+            yield title, name, query
+
+
+def read_duckdb(path, columns=None):
+    """Read the data_df view of a run database (.duckdb) as an Arrow table, keeping only the listed columns."""
+    if not os.path.exists(path):
+        logging.error(f"DuckDB file not found: {path}")
+        raise FileNotFoundError(path)
+    con = duckdb.connect(path, read_only=True)
+    try:
+        available = [row[0] for row in con.execute("DESCRIBE data_df").fetchall()]
+        selected = [_quote(c) for c in available if columns is None or c in columns]
+        logging.info(f"Reading data_df from {path} ({len(selected)} of {len(available)} columns)")
+        result = con.execute(f"SELECT {', '.join(selected)} FROM data_df").arrow()
+        return result.read_all() if hasattr(result, "read_all") else result  # RecordBatchReader on DuckDB >= 1.4
+    finally:
+        con.close()
+
+
+def read_csv(path, columns=None):
+    """
+    Read CSV file into a Pandas DataFrame, keeping only the listed columns. Values are read as text, so
+    settings such as 'True' keep their spelling; to_arrow then types the numeric columns like the Parquet artifacts.
+    """
     if not os.path.exists(path):
         logging.error(f"CSV file not found: {path}")
         raise FileNotFoundError(path)
     logging.info(f"Reading CSV from {path}")
-    return pd.read_csv(path)
+    usecols = None if columns is None else (lambda c: c in columns)
+    if os.path.isdir(path):  # partitioned artifact: <column>=<value>/part-0.csv*
+        return pd.concat([pd.read_csv(part, dtype=str, usecols=usecols)
+                          for part in sorted(glob.glob(os.path.join(path, "*", "*")))], ignore_index=True)
+    return pd.read_csv(path, dtype=str, usecols=usecols)
 
 
-def run_queries(query_list, include_all_states=False):
-    """Run a list of DuckDB queries with optional state filtering."""
+def read_parquet(path, columns=None):
+    """Read a Parquet file as an Arrow table, keeping only the listed columns that exist in it."""
+    if not os.path.exists(path):
+        logging.error(f"Parquet file not found: {path}")
+        raise FileNotFoundError(path)
+    # A partitioned artifact is a directory of part files that all share one schema and keep the partition column
+    dataset = pq.ParquetDataset(path, partitioning=None)
+    schema = dataset.schema.names
+    if columns is not None:
+        columns = [c for c in schema if c in columns]
+        logging.info(f"Reading Parquet from {path} ({len(columns)} of {len(schema)} columns)")
+    else:
+        logging.info(f"Reading Parquet from {path}")
+    return dataset.read(columns=columns)
+
+
+def to_arrow(df, columns=None):
+    """
+    Converts an in-memory frame to an Arrow table typed like the Parquet artifacts
+    (placeholder nulls become nulls, all-numeric columns become numbers). Only the listed columns are kept;
+    they are selected before the conversion, which copies the columns it types.
+    """
+    if columns is not None:
+        df = df[[c for c in df.columns if c in columns]]
+    return pa.Table.from_pandas(prepare_for_parquet(df), preserve_index=False)
+
+
+def read_summary_data(source):
+    """
+    Load the summary dataset as something DuckDB can register as data_df:
+      - a DataFrame or Arrow table handed over in memory by process_repository (no file round trip;
+        a DataFrame is projected to the summary columns, then converted to a typed copy),
+      - the merged export Parquet (read with column projection),
+      - a run database (.duckdb), whose data_df view holds the merged rows as typed columns,
+      - the star_views_*.sql script, whose flat_export view rebuilds the merged rows in DuckDB,
+      - the merged export CSV.
+    Every source comes back as an Arrow table typed like the Parquet artifacts (placeholder nulls are
+    nulls, numeric columns are numbers); summary_data_sql then types the columns the queries use.
+    """
+    if isinstance(source, pa.Table):
+        return source.select([c for c in source.column_names if c in summary_columns()])
+    if isinstance(source, pd.DataFrame):
+        return to_arrow(source, summary_columns())
+    path = str(source)
+    if path.endswith(".parquet"):
+        return read_parquet(path, summary_columns())
+    if path.endswith(".duckdb"):
+        return read_duckdb(path, summary_columns())
+    if path.endswith(".sql"):
+        if not os.path.exists(path):
+            logging.error(f"Star schema views not found: {path}")
+            raise FileNotFoundError(path)
+        logging.info(f"Reading star schema via {path}")
+        return to_arrow(load_flat_export(path, columns=summary_columns()))
+    return to_arrow(read_csv(path, summary_columns()))
+
+
+def summary_connection(threads=None, memory_limit=None):
+    """
+    Opens the in-memory DuckDB connection of one summary run. Each run registers its own data_df on
+    its own connection, so concurrent runs never see each other's data.
+    :param threads: DuckDB worker threads (default SUMMARY_DUCKDB_THREADS, else all cores).
+    :param memory_limit: DuckDB memory limit such as '2GB' (default SUMMARY_DUCKDB_MEMORY_LIMIT).
+    """
+    config = {}
+    threads = threads or SUMMARY_DUCKDB_THREADS
+    memory_limit = memory_limit or SUMMARY_DUCKDB_MEMORY_LIMIT
+    if threads:
+        config["threads"] = int(threads)
+    if memory_limit:
+        config["memory_limit"] = str(memory_limit)
+    return duckdb.connect(config=config)
+
+
+def summary_states(include_all_states=False, states=None):
+    """
+    Returns the state selection bound to $states: the given states (trimmed and lowercased, like state_key),
+    else None (every state) with include_all_states, else DEFAULT_STATES.
+    """
+    if states is not None:
+        return sorted({str(state).strip().lower() for state in states})
+    return None if include_all_states else list(DEFAULT_STATES)
+
+
+def states_literal(states):
+    """SQL literal of a state selection, for views (DuckDB cannot bind parameters in a view definition)."""
+    if states is None:
+        return "NULL::VARCHAR[]"
+    return "[" + ", ".join("'" + state.replace("'", "''") + "'" for state in states) + "]::VARCHAR[]"
+
+
+def run_queries(con, query_list, states=None, profiles=None):
+    """
+    Run a list of DuckDB queries on the run's connection. The state selection (see summary_states) is
+    bound to the queries' $states parameter, so the SQL text is the same for every selection.
+    With a profiles list, each query's wall time, row count and EXPLAIN ANALYZE plan are appended to it
+    (the query then runs a second time under EXPLAIN ANALYZE).
+    """
     dataframes = []
     for q in query_list:
-        filtered_query = apply_state_filter(q, include_all_states)
-        df = duckdb.query(filtered_query).to_df()
+        params = {"states": states} if "$states" in q else None
+        start = time.perf_counter()
+        df = con.execute(q, params).df()
+        if profiles is not None:
+            seconds = time.perf_counter() - start
+            plan = con.execute(f"EXPLAIN ANALYZE {q}", params).fetchall()
+            profiles.append({"seconds": seconds, "rows": len(df), "plan": "\n".join(row[-1] for row in plan)})
         dataframes.append(df)
     return pd.concat(dataframes, ignore_index=True)
 
 
-def create_summary(csv_result_file_path, output_docx_path, include_all_states=False):
+def run_section(con, title, content, states, profile=False):
     """
-    Creates a Word summary report based on task configuration and metrics.
-    :param csv_result_file_path: Path to the CSV export.
-    :param output_docx_path: Path for output Word file.
-    :param include_all_states: If True, includes all qem_State values. If False, filters for running only.
+    Runs one section's queries on a cursor of its own (cursors share the run's tables) and returns the
+    section dict, with its wall time in 'seconds'. With profile, 'profiles' holds the name, wall time,
+    row count and EXPLAIN ANALYZE plan of each query (see run_queries).
     """
-    # Load data
-    data_df = read_csv(csv_result_file_path)
-    data_df = data_df.astype(str)
-    duckdb.register("data_df", data_df)
-
-    # Query groups
-    queries = {
-        "Running Tasks Summary": {
-            "queries": [
-                tasksCounts.total_tasks_query,
-                tasksCounts.running_tasks_query,
-                tasksCounts.replication_tasks_query,
-                tasksCounts.logstream_tasks_query,
-                tasksCounts.apply_changes_query,
-                tasksCounts.store_changes_query,
-                tasksCounts.apply_store_changes_query,
-                tasksCounts.no_logstream_query
-            ],
-            "notes": "Provides counts of all tasks grouped by type and status."
-        },
-        "Batch Tuning Summary": {
-            "queries": [changeProcessTuning.batch_tuning],
-            "notes": "Summarizes batch tuning parameters like MIN, MAX, and Memory."
-        },
-        "Transaction Offloading Summary": {
-            "queries": [changeProcessTuning.transaction_memory],
-            "notes": "Shows memory settings for transaction offloading."
-        },
-        "Control Tables Usage": {
-            "queries": [changeProcessTuning.control_tables],
-            "notes": "Displays the use of control tables."
-        },
-        "LOB Size Summary": {
-            "queries": [changeProcessTuning.lob_size],
-            "notes": "Lists configuration for Large Object sizes."
-        },
-        "DDL Handling Policy": {
-            "queries": [handlingPolicy.ddl_handling],
-            "notes": "Shows how DDL operations are handled."
-        },
-        "General Handling Policy": {
-            "queries": [handlingPolicy.handling_policy],
-            "notes": "Displays general data handling policies."
-        },
-        "Error Handling Policy": {
-            "queries": [handlingPolicy.error_handling],
-            "notes": "Lists error handling configuration."
-        },
-        "LogStream Child Task Summary": {
-            "queries": [logStream.totalChildTasksForEachParent],
-            "notes": "Shows the number of child tasks under each log stream."
-        },
-        "Multiple LogStream Connecting to Same Source Server": {
-            "queries": [logStream.multipleLogStreamSameSourceDB],
-            "notes": "Shows the number of LogStream tasks connecting to same source database."
-        },
-        "Replication of the same Table to Multiple Targets with different Replicate servers": {
-            "queries": [tablesData.duplicate_replication_multiple_targets_with_diff_replicate_server],
-            "notes": "Lists of Tables replicate more than once to the same or more target Databases and are hosted on different Replicate servers."
-        },
-        "Replication of same Table to Same Targets": {
-            "queries": [tablesData.duplicate_replication_same_targets],
-            "notes": "Lists of Tables replicate more than once to same target DB's."
-        },
-        "LogStream tasks with NO Child/Replication tasks": {
-            "queries": [logStream.losgtreamwithNoChild],
-            "notes": "Lists of all Running LogStream tasks with NO Child/Replicate tasks."
-        },
+    start = time.perf_counter()
+    profiles = [] if profile else None
+    cursor = con.cursor()
+    try:
+        df = run_queries(cursor, content["queries"], states, profiles)
+    finally:
+        cursor.close()
+    seconds = time.perf_counter() - start
+    logging.info(f"Ran: {title} ({seconds:.3f} s)")
+    section = {
+        "title": title,
+        "notes": content["notes"],
+        "df": df,
+        "seconds": seconds,
+        "cached": False,
     }
+    if profile:
+        section["profiles"] = [dict(name=name, **entry) for name, entry in zip(content["names"], profiles)]
+    return section
+
+
+def summary_engine_sql(column_names):
+    """SQL that types data_df and builds the base relations for a dataset with these columns."""
+    return "\n;\n".join([summary_data_sql("summary_source", column_names), in_states_macro, *BASE_RELATIONS.values()])
 
-    # Run queries and collect summaries
-    summary_tables = []
-    for title, content in queries.items():
-        logging.info(f"Running: {title}")
-        df = run_queries(content["queries"], include_all_states)
-        summary_tables.append({
-            "title": title,
-            "notes": content["notes"],
-            "df": df
-        })
-
-    # Export to Word
+
+def build_summary_tables(data_source, include_all_states=False, threads=None, memory_limit=None, states=None,
+                         section_workers=None, use_cache=True, profile=False, on_cube=None):
+    """
+    Runs the summary queries and returns the sections as dicts with 'title', 'notes', 'df', 'seconds'
+    (the section's wall time) and 'cached'; nothing is written.
+    :param data_source: See create_summary.
+    :param include_all_states: If True, includes all qem_State values. If False, filters for running only.
+    :param states: QEM states to report on, e.g. ['running', 'stopped', 'error']; overrides include_all_states.
+    :param threads: DuckDB threads of this run's connection (see summary_connection).
+    :param memory_limit: DuckDB memory limit of this run's connection (see summary_connection).
+    :param section_workers: Sections run concurrently (default SUMMARY_SECTION_WORKERS); 1 runs them in order.
+    :param use_cache: Reuse section results cached for the same data, queries and states (see SummaryCache);
+                      when every section is cached, DuckDB is not used at all.
+    :param profile: Run every query (cached or not) and add its timing and EXPLAIN ANALYZE plan to the
+                    section's 'profiles'.
+    :param on_cube: Called with the settings cube (SETTINGS_CUBE_QUERY) as a DataFrame, e.g. to write it out.
+    """
+    states = summary_states(include_all_states, states)
+    section_workers = section_workers or SUMMARY_SECTION_WORKERS
+    # Load data once; it is typed into data_df only if a section has to run
+    data = read_summary_data(data_source)
+    cache = SummaryCache(data, states, summary_engine_sql(data.column_names)) if use_cache else None
+
+    sections = {}
+    if cache is not None and not profile:
+        for title, content in SUMMARY_SECTIONS.items():
+            df = cache.get(content["queries"])
+            if df is not None:
+                sections[title] = {"title": title, "notes": content["notes"], "df": df, "seconds": 0.0, "cached": True}
+    pending = [(title, content) for title, content in SUMMARY_SECTIONS.items() if title not in sections]
+    cube = cache.get([SETTINGS_CUBE_QUERY]) if on_cube is not None and cache is not None else None
+    if not pending and (on_cube is None or cube is not None):
+        logging.info(f"All {len(sections)} summary sections served from the cache")
+        if on_cube is not None:
+            on_cube(cube)
+        return list(sections.values())
+
+    con = summary_connection(threads, memory_limit)
+    try:
+        # Regular (not TEMP) tables of the run's in-memory database, so the section cursors see them
+        con.register("summary_source", data)
+        con.execute(f"CREATE TABLE data_df AS {summary_data_sql('summary_source', data.column_names)}")
+        con.unregister("summary_source")
+        con.execute(in_states_macro)
+        # Shared task-level and table-level relations, materialized once for all sections
+        for name, query in BASE_RELATIONS.items():
+            con.execute(f"CREATE TABLE {name} AS {query}")
+        if on_cube is not None and cube is None:
+            cube = con.execute(SETTINGS_CUBE_QUERY).df()
+            if cache is not None:
+                cache.put([SETTINGS_CUBE_QUERY], cube)
+
+        # Run the sections, in document order or on section_workers threads
+        start = time.perf_counter()
+        if section_workers > 1:
+            with ThreadPoolExecutor(max_workers=section_workers, thread_name_prefix="summary-section") as pool:
+                futures = [pool.submit(run_section, con, title, content, states, profile)
+                           for title, content in pending]
+                ran = [future.result() for future in futures]
+        else:
+            ran = [run_section(con, title, content, states, profile) for title, content in pending]
+        logging.info(f"Ran {len(ran)} summary sections in {time.perf_counter() - start:.3f} s "
+                     f"on {min(section_workers, len(ran))} cursor(s), {len(sections)} from the cache")
+    finally:
+        con.close()
+
+    if on_cube is not None:
+        on_cube(cube)
+    for (title, content), section in zip(pending, ran):
+        if cache is not None:
+            cache.put(content["queries"], section["df"])
+        sections[title] = section
+    return [sections[title] for title in SUMMARY_SECTIONS]
+
+
+def write_summary_doc(summary_tables, output_docx_path):
+    """Writes summary sections (as returned by build_summary_tables) to a Word document."""
     export_tables_to_word(
         summary_tables,
         output_docx_path,
         title="QLik Replicate - Task Summary",
         logo_path=logo_path
     )
-
     logging.info(f"Summary document created: {output_docx_path}")
+    return output_docx_path
+
+
+def create_summary(data_source, output_docx_path, include_all_states=False, threads=None, memory_limit=None,
+                   states=None, section_workers=None, use_cache=True, profile=False, on_cube=None):
+    """
+    Creates a Word summary report based on task configuration and metrics.
+    :param data_source: The merged export as a DataFrame or Arrow table, or a path to the merged
+        export (.parquet / .csv), to a run database (.duckdb) or to the star_views_*.sql of a star-layout run.
+    :param output_docx_path: Path for output Word file.
+    :param include_all_states: If True, includes all qem_State values. If False, filters for running only.
+    :param threads: DuckDB threads of this run's connection (default EXTRACTOR_SUMMARY_THREADS).
+    :param memory_limit: DuckDB memory limit of this run's connection (default EXTRACTOR_SUMMARY_MEMORY_LIMIT).
+    :param states: QEM states to report on (any combination, e.g. running and error); overrides include_all_states.
+    :param section_workers: Sections run concurrently (default EXTRACTOR_SUMMARY_SECTION_WORKERS, else up to 4).
+    :param use_cache: Reuse cached section results for identical data, queries and states.
+    :param profile: Add each query's timing and EXPLAIN ANALYZE plan to its section ('profiles').
+    :param on_cube: Called with the settings cube DataFrame the grouped sections roll up.
+    :return: The summary sections as dicts with 'title', 'notes', 'df', 'seconds' and 'cached'.
+    """
+    summary_tables = build_summary_tables(data_source, include_all_states, threads, memory_limit, states,
+                                          section_workers, use_cache, profile, on_cube)
+    write_summary_doc(summary_tables, output_docx_path)
+    return summary_tables
 
 
 def main():
@@ -137,7 +420,14 @@ def main():
     # You can toggle this dynamically from your UI
     include_all_states = True  # or False for "Running-only"
 
-    create_summary(csv_file_path, output_docx_path, include_all_states)
+    # python -m helpers.summary <run.duckdb | export .csv/.parquet> <output.docx> [--all-states | --states=running,error]
+    states = None
+    if len(sys.argv) > 2:
+        csv_file_path, output_docx_path = sys.argv[1], sys.argv[2]
+        include_all_states = "--all-states" in sys.argv[3:]
+        states = next((arg.split("=", 1)[1].split(",") for arg in sys.argv[3:] if arg.startswith("--states=")), None)
+
+    create_summary(csv_file_path, output_docx_path, include_all_states, states=states)
 
 
 if __name__ == "__main__":
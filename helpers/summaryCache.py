@@ -0,0 +1,84 @@
+import json
+import hashlib
+import pyarrow as pa
+from helpers.cache import FrameCache
+from helpers.logger_config import setup_logger
+
+logging = setup_logger(__name__)
+
+# Bump when cached section frames must no longer be reused (e.g. a change in how results are typed)
+SUMMARY_CACHE_VERSION = "v1"
+
+# Rows serialized per step when hashing a dataset (bounds the memory of dataset_hash)
+HASH_BATCH_ROWS = 65536
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _DigestSink:
+    """Write-only file object that feeds everything written to it into a SHA-256 digest."""
+
+    def __init__(self):
+        self.digest = hashlib.sha256()
+        self.closed = False
+
+    def write(self, data):
+        self.digest.update(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def dataset_hash(table):
+    """
+    SHA-256 of an Arrow table's schema and content, streamed as Arrow IPC into the digest HASH_BATCH_ROWS
+    rows at a time. Each batch is compacted first, so the hash does not depend on how the table is chunked.
+    Schema metadata is dropped and large_string columns hash as string, so the same data read from pandas
+    or from Parquet hashes alike.
+    """
+    schema = pa.schema([field.with_type(pa.string()) if pa.types.is_large_string(field.type) else field
+                        for field in table.schema])
+    sink = _DigestSink()
+    with pa.ipc.new_stream(pa.PythonFile(sink, mode="w"), schema) as writer:
+        for start in range(0, table.num_rows, HASH_BATCH_ROWS):
+            batch = table.slice(start, HASH_BATCH_ROWS)
+            batch = batch.take(pa.array(range(batch.num_rows))).replace_schema_metadata(None).cast(schema)
+            writer.write_table(batch.combine_chunks())
+    return sink.digest.hexdigest()
+
+
+class SummaryCache:
+    """
+    Summary section results cached as Parquet in the shared cache (namespace 'summary', LRU-evicted with
+    the rest of EXTRACTOR_CACHE_DIR). An entry is keyed by the content hash of the loaded dataset, the hash
+    of the section's query text (plus the SQL that types data_df and builds the base relations) and the
+    state selection, so regenerating a report over the same data reuses it without running DuckDB.
+    Section titles and notes are not part of the key.
+    """
+
+    def __init__(self, table, states, engine_sql, cache=None):
+        self.cache = cache or FrameCache("summary")
+        self.enabled = self.cache.enabled
+        self.dataset_key = dataset_hash(table) if self.enabled else None
+        self.engine_key = text_hash(engine_sql)
+        self.states_key = json.dumps(states)
+
+    def key(self, queries):
+        query_key = text_hash("\n;\n".join(queries))
+        return text_hash("|".join((SUMMARY_CACHE_VERSION, self.dataset_key, self.engine_key, query_key, self.states_key)))
+
+    def get(self, queries):
+        """Returns the cached result of a section's queries, or None on a miss."""
+        if not self.enabled:
+            return None
+        return self.cache.get(self.key(queries))
+
+    def put(self, queries, df):
+        if self.enabled:
+            self.cache.put(self.key(queries), df)
@@ -1,9 +1,35 @@
+import io
 import json
+import gzip
 import os
 import re
 import sys
 import csv
+import urllib.parse
+import duckdb
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from helpers.logger_config import setup_logger
+
+logging = setup_logger(__name__)
+
+# Rows per Parquet row group; each group carries min/max/null-count statistics for pruning
+PARQUET_ROW_GROUP_SIZE = 100_000
+
+# Rows per chunk when stream_dataframe_to_csv falls back to pandas
+CSV_CHUNK_ROWS = 50_000
+NEWLINE_PATTERN = r'[\r\n]+'
+
+# Streaming compression for CSV artifacts: codec -> file suffix appended after '.csv'
+CSV_COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+# Placeholder strings the extractors use for "no value"; pandas.read_csv reads them back as NaN
+NULL_MARKERS = ('NULL', 'NA', 'N/A', 'nan', 'NaN', 'None', '')
+
+# Hive-style partitioned artifacts: <artifact>/<column>=<value>/part-0.<ext>; missing values go to Hive's default
+HIVE_DEFAULT_PARTITION = '__HIVE_DEFAULT_PARTITION__'
 
 
 # Function to read JSON data from a file
@@ -13,6 +39,26 @@ def read_json_from_file(file_path):
     return data
 
 
+def read_json_source(source, default_name="repository"):
+    """
+    Returns (name, parsed JSON) for a repository export given as a path, bytes, a text or binary
+    file-like object, or a (name, source) pair. The name is the file stem where there is one
+    (it becomes json_file_name), otherwise the pair's name or default_name.
+    """
+    name = None
+    if isinstance(source, tuple):
+        name, source = source
+    if isinstance(source, (str, os.PathLike)):
+        return name or os.path.splitext(os.path.basename(source))[0], read_json_from_file(source)
+    content = source if isinstance(source, (bytes, bytearray)) else source.read()
+    if isinstance(content, (bytes, bytearray)):
+        content = bytes(content).decode("utf-8-sig")
+    file_name = getattr(source, "name", None)
+    if not name and isinstance(file_name, str):
+        name = os.path.splitext(os.path.basename(file_name))[0]
+    return name or default_name, json.loads(content.lstrip("\ufeff"))
+
+
 # For logging INFO
 
 def get_non_info_settings(config):
@@ -31,6 +77,8 @@ def get_non_info_settings(config):
 
 
 def write_dataframe_to_csv(df, csv_file_path):
+    # Original writer: scrubs newlines in every object column in place. Kept for the extractor scripts
+    # and as the benchmark baseline; main.py uses stream_dataframe_to_csv.
     try:
         for col in df.columns:
             if df[col].dtype == 'object':
@@ -41,6 +89,215 @@ def write_dataframe_to_csv(df, csv_file_path):
         print(f"Error writing to CSV file: {e}")
 
 
+def _scan_text_column(series, na_rep):
+    """
+    One C-level scan over the joined string values of series.
+    Returns (has a CR/LF, has a value equal to na_rep).
+    """
+    values = series.dropna().tolist()
+    if not values:
+        return False, False
+    if not all(isinstance(v, str) for v in values):
+        values = [v for v in values if isinstance(v, str)]
+    joined = "\x00" + "\x00".join(values) + "\x00"
+    return ("\n" in joined or "\r" in joined), f"\x00{na_rep}\x00" in joined
+
+
+def _is_text(series):
+    return series.dtype == 'object' or pd.api.types.is_string_dtype(series)
+
+
+def _duckdb_can_render(df):
+    """True when DuckDB writes every column of df the way DataFrame.to_csv would (unique names; numeric, bool or text columns)."""
+    return df.columns.is_unique and all(
+        pd.api.types.is_numeric_dtype(dtype) or dtype == 'object' or pd.api.types.is_string_dtype(dtype)
+        for dtype in df.dtypes)
+
+
+def _csv_ready(df):
+    """
+    Shallow copy of df that DuckDB renders exactly like DataFrame.to_csv: booleans become 'True'/'False'
+    and mixed-type object columns become strings (nulls are kept). Other columns are shared, not copied.
+    """
+    ready = make_arrow_safe(df)
+    for col in ready.columns:
+        series = ready[col]
+        if pd.api.types.is_bool_dtype(series) or (series.dtype == 'object' and pd.api.types.infer_dtype(series, skipna=True) == 'boolean'):
+            ready[col] = series.map(lambda v: str(v) if isinstance(v, (bool, np.bool_)) else v).astype(object)
+    return ready
+
+
+def _quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def stream_dataframe_to_csv(df, csv_file_path, na_rep='NULL', compression=None):
+    """
+    Writes df to CSV without modifying it, using DuckDB's CSV writer, which streams the frame
+    in vectors on all cores instead of formatting it row by row in Python.
+
+    Output matches write_dataframe_to_csv (python -m helpers.benchmarkCsvWriter compares both):
+    missing values are written as na_rep, and line breaks inside values are replaced by a space.
+    Only the text columns that actually contain line breaks are rewritten, inside the DuckDB
+    query; nothing is scrubbed in pandas. Lines end with '\n'.
+
+    compression ('gzip' or 'zstd') compresses the stream as it is written; the caller picks the file
+    name (see CSV_COMPRESSION_SUFFIXES).
+    """
+    if compression not in (None, *CSV_COMPRESSION_SUFFIXES):
+        raise ValueError(f"Unsupported CSV compression '{compression}', expected one of {tuple(CSV_COMPRESSION_SUFFIXES)}")
+    if not _duckdb_can_render(df):
+        _stream_with_pandas(df, csv_file_path, na_rep, compression=compression)
+        return
+
+    frame = _csv_ready(df)
+    select = []
+    for col in frame.columns:
+        expression = _quote_identifier(col)
+        series = frame[col]
+        if _is_text(series):
+            has_newline, has_na_rep = _scan_text_column(series, na_rep)
+            if has_newline:
+                expression = f"regexp_replace({expression}, '{NEWLINE_PATTERN}', ' ', 'g')"
+            if has_na_rep:
+                # Literal na_rep strings would otherwise be quoted to tell them apart from nulls
+                expression = f"NULLIF({expression}, '{na_rep}')"
+        select.append(f"{expression} AS {_quote_identifier(col)}")
+
+    con = duckdb.connect()
+    try:
+        con.register("csv_frame", frame)
+        relation = con.sql(f"SELECT {', '.join(select)} FROM csv_frame")
+        relation.write_csv(str(csv_file_path), header=True, na_rep=na_rep, compression=compression or 'none')
+    finally:
+        con.close()
+    logging.info(f"Successfully wrote data to {csv_file_path}")
+
+
+def _open_csv_stream(csv_file_path, compression=None):
+    """Opens csv_file_path for text writing, compressing on the fly with gzip or zstd."""
+    if compression == 'gzip':
+        return gzip.open(csv_file_path, 'wt', encoding='utf-8', newline='')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstandard is required for zstd-compressed CSV output (pip install zstandard)")
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(open(csv_file_path, 'wb'), closefd=True),
+                                encoding='utf-8', newline='')
+    return open(csv_file_path, 'w', encoding='utf-8', newline='')
+
+
+def _stream_with_pandas(df, csv_file_path, na_rep='NULL', chunk_size=CSV_CHUNK_ROWS, compression=None):
+    """Chunked pandas fallback for frames DuckDB cannot render like to_csv (duplicate names, dates, categories)."""
+    with _open_csv_stream(csv_file_path, compression) as f:
+        for start in range(0, max(len(df), 1), chunk_size):
+            chunk = df.iloc[start:start + chunk_size]
+            for pos in range(chunk.shape[1]):
+                series = chunk.iloc[:, pos]
+                if _is_text(series) and _scan_text_column(series, na_rep)[0]:
+                    has_newline = series.map(lambda v: isinstance(v, str) and ("\n" in v or "\r" in v))
+                    chunk = chunk.copy(deep=False)  # replace the column in the chunk only, never in df
+                    chunk.isetitem(pos, series.where(~has_newline, series[has_newline].str.replace(NEWLINE_PATTERN, ' ', regex=True)))
+            chunk.to_csv(f, index=False, header=(start == 0), na_rep=na_rep, lineterminator='\n')
+    logging.info(f"Successfully wrote data to {csv_file_path}")
+
+
+def make_arrow_safe(df):
+    """
+    Returns a copy of df that Parquet/Arrow can store: object columns holding a mix of Python types
+    (e.g. 8 and 'UnlimitedLob') are converted to strings, missing values are kept as nulls.
+    The input frame is not modified.
+    """
+    safe = df.copy(deep=False)
+    for col in safe.columns:
+        if safe[col].dtype != 'object':
+            continue
+        inferred = pd.api.types.infer_dtype(safe[col], skipna=True)
+        if inferred not in ('string', 'empty', 'integer', 'floating', 'boolean', 'bytes'):
+            safe[col] = safe[col].map(lambda v: v if v is None or (not isinstance(v, str) and pd.isna(v)) else str(v))
+    return safe
+
+
+def prepare_for_parquet(df):
+    """
+    Returns a typed copy of df for Parquet output: placeholder strings ('NULL', 'NA', ...) become nulls,
+    and text columns whose remaining values are all numeric become numeric columns, so readers get
+    real types and useful column statistics. Anything still mixed is stored as strings.
+    """
+    typed = df.copy(deep=False)
+    for col in typed.columns:
+        series = typed[col]
+        if not (series.dtype == 'object' or pd.api.types.is_string_dtype(series)):
+            continue
+        series = series.mask(series.isin(NULL_MARKERS))
+        if pd.api.types.infer_dtype(series, skipna=True) != 'boolean':
+            numeric = pd.to_numeric(series, errors='coerce')
+            if series.notna().any() and numeric.notna().sum() == series.notna().sum():
+                series = numeric
+        typed[col] = series
+    return make_arrow_safe(typed)
+
+
+def write_dataframe_to_parquet(df, parquet_file_path, row_group_size=PARQUET_ROW_GROUP_SIZE, compression='snappy'):
+    """
+    Writes df to a Parquet file with fixed-size row groups and column statistics.
+    Values are kept as-is (no newline scrubbing needed); see prepare_for_parquet for typing.
+    """
+    table = pa.Table.from_pandas(prepare_for_parquet(df), preserve_index=False)
+    pq.write_table(table, parquet_file_path, row_group_size=row_group_size,
+                   write_statistics=True, compression=compression)
+    logging.info(f"Successfully wrote data to {parquet_file_path}")
+
+
+def partition_dir_name(column, value):
+    """Hive-style directory name for one partition value: column=value, with path-unsafe characters escaped."""
+    if value is None or pd.isna(value) or str(value) in NULL_MARKERS:
+        value = HIVE_DEFAULT_PARTITION
+    return f"{column}={urllib.parse.quote(str(value), safe='')}"
+
+
+def _partitions(df, column):
+    """Yields (directory name, rows) per value of column, in value order, keeping the row order within each."""
+    names = df[column].map(lambda value: partition_dir_name(column, value))
+    for name, rows in df.groupby(names, sort=True):
+        yield name, rows
+
+
+def write_partitioned_csv(df, directory, column, na_rep='NULL', compression=None):
+    """
+    Writes df as one CSV per value of column under directory/<column>=<value>/ (Hive layout), with the
+    same writer and options as stream_dataframe_to_csv. Returns {file path: row count}.
+    """
+    file_name = 'part-0.csv' + CSV_COMPRESSION_SUFFIXES.get(compression, '')
+    written = {}
+    for name, rows in _partitions(df, column):
+        os.makedirs(os.path.join(directory, name), exist_ok=True)
+        path = os.path.join(directory, name, file_name)
+        stream_dataframe_to_csv(rows, path, na_rep=na_rep, compression=compression)
+        written[path] = len(rows)
+    logging.info(f"Successfully wrote {len(written)} partitions to {directory}")
+    return written
+
+
+def write_partitioned_parquet(df, directory, column, row_group_size=PARQUET_ROW_GROUP_SIZE, compression='snappy'):
+    """
+    Writes df as one Parquet file per value of column under directory/<column>=<value>/ (Hive layout).
+    The frame is typed once, so every partition file has the same schema. Returns {file path: row count}.
+    """
+    typed = prepare_for_parquet(df)
+    schema = pa.Schema.from_pandas(typed, preserve_index=False)
+    written = {}
+    for name, rows in _partitions(typed, column):
+        os.makedirs(os.path.join(directory, name), exist_ok=True)
+        path = os.path.join(directory, name, 'part-0.parquet')
+        table = pa.Table.from_pandas(rows, schema=schema, preserve_index=False)
+        pq.write_table(table, path, row_group_size=row_group_size, write_statistics=True, compression=compression)
+        written[path] = len(rows)
+    logging.info(f"Successfully wrote {len(written)} partitions to {directory}")
+    return written
+
+
 def load_and_prefix_columns(file_path, prefix="qem_"):
     """
     Loads a tab-separated or comma-separated file and appends a prefix to all column names.
@@ -98,17 +355,6 @@ def clean_multiline_tsv(input_file_path, output_file_path=None):
     return output_file_path
 
 
-def apply_state_filter(query: str, include_all_states: bool) -> str:
-    """
-    Injects or removes the qem_State filter in a given query dynamically.
-    """
-    if include_all_states:
-        # Remove or neutralize the 'LOWER(qem_State) = 'running'' condition if present
-        query = query.replace("WHERE LOWER(qem_State) = 'running'", "WHERE 1=1")
-        query = query.replace("AND LOWER(qem_State) = 'running'", "")
-    return query
-
-
 # Example usage
 file_path = r"C:\Users\VIT\OneDrive - QlikTech Inc\QlikVit\Customers\EdwardJones\PlatformReview\filecloud-20250430192131\AemTasks_2025-04-25_13.35.53.8.tsv"
 #df = load_and_prefix_columns(file_path, prefix="qem_")
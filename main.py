@@ -15,15 +15,27 @@
 import os
 import glob
 import sys
+import argparse
+import hashlib
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Optional, Sequence, Union
 
 import pandas as pd
 
 # Helpers
 import helpers.utils as utils
 import helpers.summary as summary
+import helpers.qemIndex as qemIndex
+import helpers.qemExports as qemExports
+import helpers.outputStage as outputStage
+import helpers.runDatabase as runDatabase
+import helpers.excelDashBoard as excelDashBoard
+import helpers.runManifest as runManifest
+import helpers.starSchema as starSchema
+import helpers.historyStore as historyStore
+from helpers.cache import FrameCache, file_hash
 from helpers.logger_config import setup_logger
 
 # Database source/target/task modules
@@ -90,8 +102,11 @@ def extract_all_settings(json_file_path: str) -> pd.DataFrame:
     if not json_data:
         logger.warning(f"No data found in {json_file_path}")
         return pd.DataFrame()
+    return extract_settings(json_data, Path(json_file_path).stem)
 
-    json_file_name = Path(json_file_path).stem
+
+def extract_settings(json_data: dict, json_file_name: str) -> pd.DataFrame:
+    """Task, source and target settings of every task in one parsed repository export."""
     tasks = json_data['cmd.replication_definition'].get('tasks', [])
     databases_list = json_data['cmd.replication_definition'].get('databases', [])
 
@@ -140,10 +155,159 @@ def extract_all_settings(json_file_path: str) -> pd.DataFrame:
     result = pd.concat(all_rows, ignore_index=True).fillna("NULL")
     return result
 
+# -----------------------------------------------------------------------------
+# Repository extraction (cached per repository fingerprint)
+# -----------------------------------------------------------------------------
+REPOSITORY_FRAMES = ("server_settings", "server_schedules", "notifications", "task_settings", "tables")
+
+# Bump when the extractors change so snapshots from older code are not reused
+EXTRACT_CACHE_VERSION = "v1"
+
+
+SERVER_EXTRACTORS = {
+    "server_settings": retrieveServerSettings.extract_server_settings,
+    "server_schedules": retrieveScheduledTasks.extract_schedule_settings,
+    "notifications": retrieveNotifications.extract_notification_settings,
+}
+
+
+def extract_json_frames(json_data: dict, json_file_name: str) -> Dict[str, pd.DataFrame]:
+    """Runs every extractor over one parsed repository export; a failing server-level extractor yields an empty frame."""
+    logger.info(f"Processing: {json_file_name}")
+    if not json_data:
+        logger.warning(f"No data found in {json_file_name}")
+
+    # Task & Tables
+    frames = {
+        "task_settings": extract_settings(json_data, json_file_name) if json_data else pd.DataFrame(),
+        "tables": retrieveTables.extract_tables(json_file_name, json_data),
+    }
+
+    # Server-level settings
+    for name, extractor in SERVER_EXTRACTORS.items():
+        try:
+            data, column_names = extractor(json_data)
+            frames[name] = pd.DataFrame(data, columns=column_names) if data else pd.DataFrame()
+        except Exception as e:
+            logger.error(f"Could not extract {name} from {json_file_name}: {e}")
+            frames[name] = pd.DataFrame()
+    return frames
+
+
+def combine_frames(per_file_frames) -> Dict[str, pd.DataFrame]:
+    """Concatenates the per-file frames of every repository export into one frame per REPOSITORY_FRAMES name."""
+    per_file_frames = list(per_file_frames)
+    frames = {}
+    for name in REPOSITORY_FRAMES:
+        dfs = [file_frames[name] for file_frames in per_file_frames if not file_frames[name].empty]
+        frames[name] = pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
+    return frames
+
+
+def extract_repository(json_file_paths) -> Dict[str, pd.DataFrame]:
+    """Runs every extractor over the repository JSON files (each parsed once) and returns the combined frames."""
+    return combine_frames(extract_json_frames(utils.read_json_from_file(json_path), Path(json_path).stem)
+                          for json_path in json_file_paths)
+
+
+def repository_fingerprint(json_file_paths) -> str:
+    """Hash of the JSON inputs (file name + content), identifying one repository snapshot."""
+    digest = hashlib.sha256(EXTRACT_CACHE_VERSION.encode())
+    for json_path in sorted(json_file_paths, key=lambda p: Path(p).name):
+        digest.update(Path(json_path).stem.encode("utf-8"))
+        digest.update(file_hash(json_path).encode("ascii"))
+    return digest.hexdigest()
+
+
+def load_or_extract_repository(json_file_paths, reuse_extraction: bool = True) -> Dict[str, pd.DataFrame]:
+    """
+    Returns the extracted repository frames, reusing the snapshot persisted by a previous run
+    (CLI or backend) when the JSON inputs are unchanged. A run that only swaps the QEM export
+    then skips the extraction and goes straight to the QEM join, merged export and summary.
+    """
+    cache = FrameCache("extract")
+    fingerprint = repository_fingerprint(json_file_paths)
+
+    if reuse_extraction:
+        frames = {name: cache.get(f"{fingerprint}-{name}") for name in REPOSITORY_FRAMES}
+        if all(df is not None for df in frames.values()):
+            logger.info(f"Repository unchanged ({fingerprint[:12]}) - reusing extracted frames, re-merging QEM only")
+            return frames
+
+    frames = extract_repository(json_file_paths)
+    for name, df in frames.items():
+        cache.put(f"{fingerprint}-{name}", df)
+    return frames
+
+def build_qem_index(qem_df: pd.DataFrame) -> qemIndex.QemIndex:
+    """Normalized-key hash index over the QEM rows, built once per run; the export must have Task and Server columns."""
+    qem_task_col = next((c for c in qem_df.columns if c.lower() == "qem_task"), None)
+    qem_server_col = next((c for c in qem_df.columns if c.lower() == "qem_server"), None)
+
+    if not qem_task_col or not qem_server_col:
+        logger.error(f"Required QEM columns not found: {qem_df.columns.tolist()}")
+        raise KeyError(f"Required QEM columns not found: {qem_df.columns.tolist()}")
+    return qemIndex.QemIndex(qem_df, qem_task_col, qem_server_col)
+
 # -----------------------------------------------------------------------------
 # Repository processing
 # -----------------------------------------------------------------------------
-def process_repository(folder_path_or_files, qem_export_path: str, include_all_states = False) -> Dict[str, str]:
+OUTPUT_LAYOUTS = ("flat", "star")
+OUTPUT_FORMATS = ("csv", "parquet", "both")
+OUTPUT_COMPRESSIONS = ("gzip", "zstd")
+
+# Partition column of each artifact when partitioning by server: the first of these present in the frame
+PARTITION_COLUMNS = ("replicate_server", "tables_replicate_server")
+
+
+@dataclass
+class OutputOptions:
+    """Artifacts a run writes and how (the CLI's --layout, --format, --compress, ... flags)."""
+    layout: str = "flat"
+    format: str = "csv"
+    compression: Optional[str] = None
+    merged_export: bool = True
+    database: bool = False
+    excel: bool = False
+    partition_by_server: bool = False
+    workers: Optional[int] = None
+
+    def validate(self) -> None:
+        if self.layout not in OUTPUT_LAYOUTS:
+            raise ValueError(f"Unknown output layout '{self.layout}', expected one of {OUTPUT_LAYOUTS}")
+        if self.format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{self.format}', expected one of {OUTPUT_FORMATS}")
+        if self.compression not in (None, *OUTPUT_COMPRESSIONS):
+            raise ValueError(f"Unknown output compression '{self.compression}', expected one of {OUTPUT_COMPRESSIONS}")
+
+
+@dataclass
+class SummaryOptions:
+    """How the Word summary is computed (the CLI's --states, --summary-*, ... flags)."""
+    states: Optional[Sequence[str]] = None
+    threads: Optional[int] = None
+    memory_limit: Optional[str] = None
+    workers: Optional[int] = None
+    profile_queries: bool = False
+
+
+def process_repository(folder_path_or_files, qem_export_path: Union[str, Sequence[str]], include_all_states = False,
+                       reuse_extraction: bool = True, output_options: Optional[OutputOptions] = None,
+                       summary_options: Optional[SummaryOptions] = None,
+                       history_customer: Optional[str] = None) -> Dict[str, str]:
+    """
+    Extracts settings from the repository JSON exports, merges them with the QEM export(s) and writes the
+    artifacts, Word summary and run manifest into <folder>/run_output_<timestamp>. Returns the paths by key.
+    qem_export_path may be a single TSV, a folder of TSVs or a list of TSVs; tasks present in several
+    exports keep the row from the newest export. With reuse_extraction, cached extraction and summary
+    results are reused. See OutputOptions, SummaryOptions and the README's run options table.
+    """
+    output_options = output_options or OutputOptions()
+    summary_options = summary_options or SummaryOptions()
+    output_options.validate()
+    output_layout, output_format = output_options.layout, output_options.format
+    output_compression, partition_by_server = output_options.compression, output_options.partition_by_server
+
     # Determine input type
     if isinstance(folder_path_or_files, (list, tuple)):
         json_file_paths = folder_path_or_files
@@ -161,109 +325,419 @@ def process_repository(folder_path_or_files, qem_export_path: str, include_all_s
     os.makedirs(output_dir, exist_ok=True)
     logger.info(f"Output directory: {output_dir}")
 
-    # Clean QEM TSV
-    cleaned_qem_path = utils.clean_multiline_tsv(qem_export_path)
-    logger.info(f"Cleaned QEM file: {cleaned_qem_path}")
+    qem_inputs = [qem_export_path] if isinstance(qem_export_path, (str, os.PathLike)) else qem_export_path
+    manifest = runManifest.RunManifest(
+        output_dir, timestamp,
+        options={"include_all_states": include_all_states,
+                 "summary_states": summary.summary_states(include_all_states, summary_options.states),
+                 "reuse_extraction": reuse_extraction,
+                 "output_layout": output_layout, "output_format": output_format,
+                 "write_merged_export": output_options.merged_export, "output_compression": output_compression,
+                 "write_database": output_options.database, "write_excel": output_options.excel,
+                 "partition_by_server": partition_by_server, "history_customer": history_customer,
+                 "profile_queries": summary_options.profile_queries},
+        inputs={"json_files": sorted(Path(p).name for p in json_file_paths),
+                "qem_exports": [os.path.basename(str(p)) for p in qem_inputs]})
 
     # Collect data
-    task_settings_list, tables_list = [], []
-    server_settings_list, schedules_list, notifications_list = [], [], []
-
-    for json_path in json_file_paths:
-        json_file_name = Path(json_path).stem
-        logger.info(f"Processing: {json_file_name}")
-
-        # Task & Tables
-        task_df = extract_all_settings(json_path)
-        table_df = retrieveTables.extract_tables_dataframe(json_file_name, json_path)
-
-        if not task_df.empty: task_settings_list.append(task_df)
-        if not table_df.empty: tables_list.append(table_df)
-
-        # Server-level settings
-        server_df = retrieveServerSettings.extract_server_data_to_dataframe(json_path)
-        schedule_df = retrieveScheduledTasks.extract_server_data_to_dataframe(json_path)
-        notification_df = retrieveNotifications.extract_notifications_to_dataframe(json_path)
-
-        if not server_df.empty: server_settings_list.append(server_df)
-        if not schedule_df.empty: schedules_list.append(schedule_df)
-        if not notification_df.empty: notifications_list.append(notification_df)
-
-    # Helper to combine and write
-    def _combine_and_write(dfs: List[pd.DataFrame], filename: str) -> str:
-        if not dfs: return ""
-        combined = pd.concat(dfs, ignore_index=True)
-        output_path = os.path.join(output_dir, filename)
-        utils.write_dataframe_to_csv(combined, output_path)
-        logger.info(f"Wrote file: {output_path}")
-        return output_path
-
-    output_paths = {
-        "server_settings": _combine_and_write(server_settings_list, f"serverSettings_{timestamp}.csv"),
-        "server_schedules": _combine_and_write(schedules_list, f"serverSchedules_{timestamp}.csv"),
-        "notifications": _combine_and_write(notifications_list, f"serverNotifications_{timestamp}.csv"),
-        "task_settings": _combine_and_write(task_settings_list, f"taskSettings_{timestamp}.csv"),
-        "tables": _combine_and_write(tables_list, f"tables_{timestamp}.csv"),
-    }
-
-    # Merge QEM
-    qem_df = pd.read_csv(cleaned_qem_path, sep="\t", engine="python", encoding="utf-8")
-    qem_df = qem_df.add_prefix("qem_")
-    qem_task_col = next((c for c in qem_df.columns if c.lower() == "qem_task"), None)
-    qem_server_col = next((c for c in qem_df.columns if c.lower() == "qem_server"), None)
+    frames = load_or_extract_repository(json_file_paths, reuse_extraction)
+    manifest.lap("extract")
+
+    # Independent artifact writes run on a thread pool as soon as their frames are ready
+    stage = outputStage.OutputStage(output_options.workers)
+    output_paths = {}
+    partitioned_paths = set()
+
+    csv_suffix = ".csv" + utils.CSV_COMPRESSION_SUFFIXES.get(output_compression, "")
+    parquet_codec = output_compression or "snappy"
+
+    def _write_file(writer, df: pd.DataFrame, path: str, **options) -> None:
+        writer(df, path, **options)
+        logger.info(f"Wrote file: {path}")
+
+    # Runs one write on the output stage and records the written file in the manifest
+    def _submit(name: str, key: str, path: str, produced_by: str, func, *args, rows: Optional[int] = None, **kwargs):
+        def job():
+            result = func(*args, **kwargs)
+            manifest.add_artifact(key, path, produced_by, rows=rows, job=name)
+            return result
+        return stage.submit(name, job)
+
+    # Partitioned writes return {file: rows}; every partition file is recorded in the manifest
+    def _submit_partitioned(name: str, key: str, produced_by: str, func, *args, **kwargs):
+        def job():
+            parts = func(*args, **kwargs)
+            for part_path, rows in parts.items():
+                manifest.add_artifact(key, part_path, produced_by, rows=rows, job=name)
+            return parts
+        return stage.submit(name, job)
+
+    # Schedules one artifact in the requested format(s); returns the primary path
+    def _write(df: pd.DataFrame, key: str, stem: str, produced_by: str, skip_empty: bool = False) -> str:
+        if skip_empty and df.empty:
+            output_paths[key] = ""
+            return ""
+        written = []
+        partition_col = None
+        if partition_by_server and not df.empty:
+            partition_col = next((c for c in PARTITION_COLUMNS if c in df.columns), None)
+        if output_format in ("csv", "both"):
+            csv_path = os.path.join(output_dir, f"{stem}_{timestamp}{csv_suffix}")
+            if partition_col:
+                partitioned_paths.add(csv_path)
+                _submit_partitioned(f"{stem}{csv_suffix}", key, produced_by, utils.write_partitioned_csv, df, csv_path,
+                                    partition_col, compression=output_compression)
+            else:
+                _submit(f"{stem}{csv_suffix}", key, csv_path, produced_by, _write_file, utils.stream_dataframe_to_csv,
+                        df, csv_path, rows=len(df), compression=output_compression)
+            written.append(csv_path)
+        if output_format in ("parquet", "both"):
+            parquet_path = os.path.join(output_dir, f"{stem}_{timestamp}.parquet")
+            parquet_key = f"{key}_parquet" if output_format == "both" else key
+            if partition_col:
+                partitioned_paths.add(parquet_path)
+                _submit_partitioned(f"{stem}.parquet", parquet_key, produced_by, utils.write_partitioned_parquet, df,
+                                    parquet_path, partition_col, compression=parquet_codec)
+            else:
+                _submit(f"{stem}.parquet", parquet_key, parquet_path, produced_by, _write_file,
+                        utils.write_dataframe_to_parquet, df, parquet_path, rows=len(df), compression=parquet_codec)
+            written.append(parquet_path)
+            if output_format == "both":
+                output_paths[parquet_key] = parquet_path
+        output_paths[key] = written[0]
+        return written[0]
+
+    def _readable(key: str) -> str:
+        # Parquet copy when one was written (typed, column-pruned reads), otherwise the primary file
+        return output_paths.get(f"{key}_parquet") or output_paths.get(key) or ""
 
-    if not qem_task_col or not qem_server_col:
-        logger.error(f"Required QEM columns not found: {qem_df.columns.tolist()}")
-        raise KeyError(f"Required QEM columns not found: {qem_df.columns.tolist()}")
+    try:
+        _write(frames["server_settings"], "server_settings", "serverSettings", "extract", skip_empty=True)
+        _write(frames["server_schedules"], "server_schedules", "serverSchedules", "extract", skip_empty=True)
+        _write(frames["notifications"], "notifications", "serverNotifications", "extract", skip_empty=True)
+        if output_layout == "flat":
+            _write(frames["task_settings"], "task_settings", "taskSettings", "extract", skip_empty=True)
+            _write(frames["tables"], "tables", "tables", "extract", skip_empty=True)
+
+        # Merge QEM (one or more exports, streamed and de-duplicated on server + task)
+        qem_df = qemExports.read_qem_exports(qem_export_path)
+        qem_index = build_qem_index(qem_df)
+        combined_task_df = frames["task_settings"]
+        combined_tables_df = frames["tables"]
+        manifest.lap("qem_read")
+
+        if output_layout == "star":
+            # Keyed tables instead of the fan-out merge; the flat shape is a DuckDB view away
+            qem_positions = qem_index.match(combined_task_df, 'task_name', ('json_file_name', 'replicate_server'))
+            star = starSchema.build_star_schema(combined_task_df, qem_df, qem_positions, combined_tables_df)
+            view_paths = {}
+            for name, df in star.items():
+                _write(df, f"star_{name}", f"star_{name}", "star_schema")
+                view_paths[name] = _readable(f"star_{name}")
+            for frame_name, view_name in starSchema.SERVER_TABLES.items():
+                view_paths[view_name] = _readable(frame_name)
+            summary_source = starSchema.write_views(view_paths, os.path.join(output_dir, f"star_views_{timestamp}.sql"),
+                                                partitioned_paths)
+            output_paths["star_views"] = summary_source
+            manifest.add_artifact("star_views", summary_source, "star_schema")
+            manifest.lap("star_schema")
+        else:
+            _write(qem_df, "qem_export", "qem_data", "qem_read")
+
+            # Merge task settings with QEM
+            task_qem_merged = qem_index.merge(combined_task_df)
+            _write(task_qem_merged, "task_qem_merge", "task_settings_qem_merge", "qem_merge")
+            manifest.lap("qem_merge")
+
+            # Merge with tables; the summary reads the frame from memory while the file is written alongside
+            merged_df = qemIndex.merge_tables(task_qem_merged, combined_tables_df)
+            if output_options.merged_export:
+                _write(merged_df, "merged", "exportRepositoryCSV", "tables_merge")
+            summary_source = merged_df
+            manifest.lap("tables_merge")
+
+        # Report join misses so they can be fixed without re-running the extraction
+        unmatched_df = qem_index.unmatched_report(combined_task_df)
+        unmatched_path = _write(unmatched_df, "qem_unmatched", "qem_unmatched", "unmatched_report")
+        logger.info(f"QEM join misses: {len(unmatched_df)} (see {unmatched_path})")
+        manifest.lap("unmatched_report")
+
+        # One DuckDB file with every frame as a typed table plus the report views
+        if output_options.database:
+            database_tables = {
+                "server_settings": frames["server_settings"],
+                "server_schedules": frames["server_schedules"],
+                "server_notifications": frames["notifications"],
+                "qem_unmatched": unmatched_df,
+            }
+            if output_layout == "star":
+                database_tables.update(star)
+            else:
+                database_tables.update({"task_settings": combined_task_df, "tables": combined_tables_df, "qem": qem_df,
+                                        "task_qem_merge": task_qem_merged, "flat_export": merged_df})
+            database_path = os.path.join(output_dir, f"run_{timestamp}.duckdb")
+            _submit("run.duckdb", "run_database", database_path, "run_database", runDatabase.write_run_database,
+                    database_path, database_tables, star=(output_layout == "star"))
+            output_paths["run_database"] = database_path
+
+        if output_layout == "star":
+            if output_options.database:
+                stage.wait("run.duckdb")
+                summary_source = database_path  # typed tables, nothing re-parsed
+            else:
+                stage.wait()  # the views read the star and server tables from disk
+            manifest.lap("star_views_wait")
+
+        # Generate Word summary alongside the remaining writes
+        summary_path = os.path.join(output_dir, f"task_summary_{timestamp}.docx")
+        summary_job = _submit("task_summary.docx", "summary_doc", summary_path, "summary", summary.create_summary,
+                              summary_source, summary_path, include_all_states, summary_options.threads,
+                              summary_options.memory_limit, summary_options.states, summary_options.workers,
+                              reuse_extraction, summary_options.profile_queries,
+                              on_cube=lambda cube: _write(cube, "settings_cube", "settingsCube", "summary"))
+        output_paths["summary_doc"] = summary_path
+
+        # Append the run to the customer's history store from the same dataset the summary reads
+        if history_customer:
+            def _record_history():
+                try:
+                    historyStore.ingest_run(summary_source, datetime.strptime(timestamp, "%Y%m%d_%H%M%S"),
+                                            output_dir, manifest.inputs, customer=history_customer)
+                except Exception as e:
+                    logger.warning(f"Could not add the run to the history store: {e}")
+
+            stage.submit("history", _record_history)
+
+        # Streaming XLSX workbook: summary sections plus one sheet per artifact
+        if output_options.excel:
+            workbook_sheets = {
+                "serverSettings": frames["server_settings"],
+                "serverSchedules": frames["server_schedules"],
+                "serverNotifications": frames["notifications"],
+            }
+            if output_layout == "star":
+                workbook_sheets.update({f"star_{name}": df for name, df in star.items()})
+            else:
+                workbook_sheets.update({"taskSettings": combined_task_df, "tables": combined_tables_df, "qem_data": qem_df,
+                                        "task_settings_qem_merge": task_qem_merged})
+                if output_options.merged_export:
+                    workbook_sheets["exportRepositoryCSV"] = merged_df
+            workbook_sheets["qem_unmatched"] = unmatched_df
+            workbook_path = os.path.join(output_dir, f"run_{timestamp}.xlsx")
+
+            def _write_workbook():
+                # Queued after the summary, so waiting on it here cannot starve the pool
+                return excelDashBoard.write_workbook(workbook_path, workbook_sheets, summary_job.result())
+
+            _submit("run.xlsx", "workbook", workbook_path, "workbook", _write_workbook)
+            output_paths["workbook"] = workbook_path
+        stage.wait()
+    finally:
+        stage.close()
 
-    qem_path = os.path.join(output_dir, f"qem_data_{timestamp}.csv")
-    utils.write_dataframe_to_csv(qem_df, qem_path)
-    output_paths["qem_export"] = qem_path
-    logger.info(f"Wrote QEM export: {qem_path}")
-
-    # Merge task settings with QEM
-    combined_task_df = pd.concat(task_settings_list, ignore_index=True)
-    task_qem_merged = combined_task_df.merge(
-        qem_df,
-        left_on=['task_name', 'json_file_name'],
-        right_on=[qem_task_col, qem_server_col],
-        how='left'
-    )
-    task_qem_path = os.path.join(output_dir, f"task_settings_qem_merge_{timestamp}.csv")
-    utils.write_dataframe_to_csv(task_qem_merged, task_qem_path)
-    output_paths["task_qem_merge"] = task_qem_path
-
-    # Merge with tables
-    combined_tables_df = pd.concat(tables_list, ignore_index=True)
-    merged_df = task_qem_merged.merge(
-        combined_tables_df,
-        left_on=['task_name', 'json_file_name'],
-        right_on=['tables_task_name', 'tables_json_file_name'],
-        how='outer'
-    )
-    merged_path = os.path.join(output_dir, f"exportRepositoryCSV_{timestamp}.csv")
-    utils.write_dataframe_to_csv(merged_df, merged_path)
-    output_paths["merged"] = merged_path
-
-    # Generate Word summary
-    summary_path = os.path.join(output_dir, f"task_summary_{timestamp}.docx")
-    summary.create_summary(merged_path, summary_path, include_all_states)
-    output_paths["summary_doc"] = summary_path
+    stage.log_timings()
+    manifest.add_output_stage(stage)
+    manifest.add_summary_sections(summary_job.result())
+    output_paths["manifest"] = manifest.write(os.path.join(output_dir, f"run_manifest_{timestamp}.json"))
     logger.info(" Processing completed successfully!")
     for k, v in output_paths.items():
         logger.info(f"{k:20}: {v}")
 
     return output_paths
 
+# -----------------------------------------------------------------------------
+# In-memory API (no output folder, no cache, nothing written until persist())
+# -----------------------------------------------------------------------------
+# File stem of each frame when a result is persisted (same names as process_repository's artifacts)
+ARTIFACT_STEMS = {
+    "server_settings": "serverSettings",
+    "server_schedules": "serverSchedules",
+    "notifications": "serverNotifications",
+    "task_settings": "taskSettings",
+    "tables": "tables",
+    "qem_export": "qem_data",
+    "task_qem_merge": "task_settings_qem_merge",
+    "merged": "exportRepositoryCSV",
+    "qem_unmatched": "qem_unmatched",
+}
+
+
+class RunResult:
+    """
+    Frames and summary sections of one in-memory run (see analyze_repository).
+
+    frames maps the keys process_repository uses for its artifacts (server_settings, server_schedules,
+    notifications, task_settings, tables, qem_export, task_qem_merge, merged, qem_unmatched) to
+    DataFrames; summary_tables holds the summary sections as dicts with 'title', 'notes' and 'df'.
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], summary_tables: list, include_all_states: bool = False,
+                 summary_states: Optional[Sequence[str]] = None):
+        self.frames = frames
+        self.summary_tables = summary_tables
+        self.include_all_states = include_all_states
+        self.summary_states = summary_states
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    def persist(self, output_dir: str, output_format: str = "csv", output_compression: Optional[str] = None,
+                write_summary: bool = True, output_workers: Optional[int] = None) -> Dict[str, str]:
+        """
+        Writes the frames (and the Word summary) into output_dir with the same names, formats and
+        writers as process_repository, plus a run manifest. Returns the written paths by key.
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}', expected one of {OUTPUT_FORMATS}")
+        if output_compression not in (None, *OUTPUT_COMPRESSIONS):
+            raise ValueError(f"Unknown output compression '{output_compression}', expected one of {OUTPUT_COMPRESSIONS}")
+        os.makedirs(output_dir, exist_ok=True)
+        manifest = runManifest.RunManifest(output_dir, self.timestamp,
+                                           options={"include_all_states": self.include_all_states,
+                                                    "summary_states": summary.summary_states(
+                                                        self.include_all_states, self.summary_states),
+                                                    "output_format": output_format,
+                                                    "output_compression": output_compression})
+        stage = outputStage.OutputStage(output_workers)
+        csv_suffix = ".csv" + utils.CSV_COMPRESSION_SUFFIXES.get(output_compression, "")
+        output_paths = {}
+
+        def _job(name, key, path, rows, func, *args, **kwargs):
+            def job():
+                func(*args, **kwargs)
+                manifest.add_artifact(key, path, "persist", rows=rows, job=name)
+            stage.submit(name, job)
+            output_paths[key] = path
+
+        try:
+            for key, df in self.frames.items():
+                stem = ARTIFACT_STEMS.get(key, key)
+                if output_format in ("csv", "both"):
+                    path = os.path.join(output_dir, f"{stem}_{self.timestamp}{csv_suffix}")
+                    _job(f"{stem}{csv_suffix}", key, path, len(df), utils.stream_dataframe_to_csv, df, path,
+                         compression=output_compression)
+                if output_format in ("parquet", "both"):
+                    path = os.path.join(output_dir, f"{stem}_{self.timestamp}.parquet")
+                    _job(f"{stem}.parquet", f"{key}_parquet" if output_format == "both" else key, path, len(df),
+                         utils.write_dataframe_to_parquet, df, path, compression=output_compression or "snappy")
+            if write_summary and self.summary_tables:
+                path = os.path.join(output_dir, f"task_summary_{self.timestamp}.docx")
+                # The Word export numbers the rows of the tables it is given, so it gets copies
+                tables = [dict(section, df=section["df"].copy()) for section in self.summary_tables]
+                _job("task_summary.docx", "summary_doc", path, None, summary.write_summary_doc, tables, path)
+            stage.wait()
+        finally:
+            stage.close()
+
+        manifest.add_output_stage(stage)
+        manifest.add_summary_sections(self.summary_tables)
+        output_paths["manifest"] = manifest.write(os.path.join(output_dir, f"run_manifest_{self.timestamp}.json"))
+        return output_paths
+
+
+def analyze_repository(json_sources, qem_sources, include_all_states: bool = False,
+                       with_summary: bool = True, summary_options: Optional[SummaryOptions] = None) -> RunResult:
+    """
+    In-memory counterpart of process_repository (flat layout): extracts the repository exports, merges
+    them with the QEM export(s) and runs the summary queries without touching the filesystem - no output
+    folder, no extraction/QEM cache, no Word document. Call persist() on the result to write it out.
+
+    json_sources: one repository export or a list of them, each a path, bytes, a file-like object or a
+        (name, source) pair. The name (file stem by default) is the json_file_name used to match QEM rows.
+    qem_sources: one QEM export or a list of them, each a path (file or folder), bytes, a file-like object
+        or a (name, source) pair; see qemExports.read_qem_sources for how duplicates are resolved.
+    summary_options: see SummaryOptions (profile_queries does not apply, nothing is cached here).
+    """
+    summary_options = summary_options or SummaryOptions()
+    json_items = json_sources if isinstance(json_sources, list) else [json_sources]
+    if not json_items:
+        raise ValueError("At least one repository export is required")
+    parsed = [utils.read_json_source(item, default_name=f"repository_{i}") for i, item in enumerate(json_items)]
+    frames = combine_frames(extract_json_frames(json_data, name) for name, json_data in parsed)
+
+    qem_df = qemExports.read_qem_sources(qem_sources)
+    qem_index = build_qem_index(qem_df)
+    task_qem_merged = qem_index.merge(frames["task_settings"])
+    merged_df = qemIndex.merge_tables(task_qem_merged, frames["tables"])
+
+    frames.update({
+        "qem_export": qem_df,
+        "task_qem_merge": task_qem_merged,
+        "merged": merged_df,
+        "qem_unmatched": qem_index.unmatched_report(frames["task_settings"]),
+    })
+    summary_tables = []
+    if with_summary:
+        summary_tables = summary.build_summary_tables(merged_df, include_all_states, summary_options.threads,
+                                                      summary_options.memory_limit, summary_options.states,
+                                                      summary_options.workers,
+                                                      use_cache=False)
+    return RunResult(frames, summary_tables, include_all_states, summary_options.states)
+
 # -----------------------------------------------------------------------------
 # Main entry point
 # -----------------------------------------------------------------------------
 if __name__ == "__main__":
-    try:
-        folder_path = r"C:\Users\VIT\OneDrive - QlikTech Inc\QlikVit\Customers\Dennis"
-        qem_export_path = os.path.join(folder_path, "AemTasks_2025-10-08_13.48.03.491.tsv")
+    default_folder = r"C:\Users\VIT\OneDrive - QlikTech Inc\QlikVit\Customers\Dennis"
+    parser = argparse.ArgumentParser(
+        description="Extract Qlik Replicate settings from repository JSON and QEM exports.",
+        epilog="Environment: EXTRACTOR_CACHE_DIR / EXTRACTOR_CACHE_MAX_MB (cache, 0 disables it), "
+               "EXTRACTOR_OUTPUT_WORKERS, EXTRACTOR_SUMMARY_THREADS / _MEMORY_LIMIT / _SECTION_WORKERS, "
+               "EXTRACTOR_QUERY_DIRS (extra summary section folders), EXTRACTOR_HISTORY_DIR (--history databases).")
+    parser.add_argument("folder", nargs="?", default=default_folder,
+                        help="Folder containing the repository JSON exports")
+    parser.add_argument("--qem", nargs="+", default=None,
+                        help="QEM export TSV file(s) or folder(s); defaults to the TSVs in the JSON folder")
+    parser.add_argument("--all-states", action="store_true",
+                        help="Include tasks in every QEM state in the summary (default: running only)")
+    parser.add_argument("--states", nargs="+", default=None, dest="summary_states",
+                        help="QEM states the summary covers, e.g. --states running stopped error (overrides --all-states)")
+    parser.add_argument("--layout", choices=OUTPUT_LAYOUTS, default="flat",
+                        help="flat: merged exportRepositoryCSV (default); star: keyed star_* tables plus "
+                             "star_views_<timestamp>.sql, whose flat_export view rebuilds the merged rows")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="csv", dest="output_format",
+                        help="csv (default), parquet (typed, row groups with statistics) or both; the summary "
+                             "and the star views read the Parquet files when they exist")
+    parser.add_argument("--compress", choices=OUTPUT_COMPRESSIONS, default=None,
+                        help="Compress artifacts while writing: .csv.gz / .csv.zst, and the same codec inside Parquet")
+    parser.add_argument("--duckdb", action="store_true", dest="write_database",
+                        help="Also write run_<timestamp>.duckdb: every frame as a typed table, a data_df view and "
+                             "report.<query> / report_all_states.<query> views (star runs build the summary from it)")
+    parser.add_argument("--xlsx", action="store_true", dest="write_excel",
+                        help="Also write run_<timestamp>.xlsx with the summary sections and one sheet per artifact")
+    parser.add_argument("--partition-by-server", action="store_true",
+                        help="Write artifacts with a replicate_server column as replicate_server=<server>/part-0.* "
+                             "folders (Hive layout); qem_data, star endpoints/qem and empty frames stay single files")
+    parser.add_argument("--summary-threads", type=int, default=None,
+                        help="DuckDB threads for the summary queries (default: EXTRACTOR_SUMMARY_THREADS or all cores)")
+    parser.add_argument("--summary-memory", default=None, dest="summary_memory_limit",
+                        help="DuckDB memory limit for the summary queries, e.g. 2GB (default: EXTRACTOR_SUMMARY_MEMORY_LIMIT)")
+    parser.add_argument("--summary-workers", type=int, default=None,
+                        help="Summary sections run concurrently (default: EXTRACTOR_SUMMARY_SECTION_WORKERS or up to 4; 1 = in order)")
+    parser.add_argument("--skip-merged-export", action="store_true",
+                        help="Do not write exportRepositoryCSV (the summary is built from memory either way)")
+    parser.add_argument("--writers", type=int, default=None,
+                        help="Threads writing output artifacts concurrently (default: EXTRACTOR_OUTPUT_WORKERS or CPUs + 2, max 8)")
+    parser.add_argument("--profile-queries", action="store_true",
+                        help="Record each summary query's EXPLAIN ANALYZE plan and wall time in the run manifest "
+                             "(bypasses the summary cache)")
+    parser.add_argument("--history", default=None, metavar="CUSTOMER", dest="history_customer",
+                        help="Add this run to the customer's history database, "
+                             "<EXTRACTOR_HISTORY_DIR or history>/<CUSTOMER>.duckdb (off by default)")
+    parser.add_argument("--no-reuse", action="store_true",
+                        help="Always re-extract the repository JSON and re-run the summary queries, even if cached results exist")
+    args = parser.parse_args()
 
-        output_files = process_repository(folder_path, qem_export_path)
+    try:
+        qem_export_path = args.qem or args.folder
+        output_options = OutputOptions(layout=args.layout, format=args.output_format, compression=args.compress,
+                                       merged_export=not args.skip_merged_export, database=args.write_database,
+                                       excel=args.write_excel, partition_by_server=args.partition_by_server,
+                                       workers=args.writers)
+        summary_options = SummaryOptions(states=args.summary_states, threads=args.summary_threads,
+                                         memory_limit=args.summary_memory_limit, workers=args.summary_workers,
+                                         profile_queries=args.profile_queries)
+        output_files = process_repository(args.folder, qem_export_path, args.all_states,
+                                          reuse_extraction=not args.no_reuse, output_options=output_options,
+                                          summary_options=summary_options, history_customer=args.history_customer)
 
     except Exception as e:
         logger.exception(" Fatal error occurred")